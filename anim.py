@@ -0,0 +1,216 @@
+# anim.py — compact pre-rendered animation format (.dpa) + streaming reader
+#
+# Built for long clips (Bad Apple, the README videos) that blow the heap
+# when embedded as a Python module. Frames are streamed from flash one
+# record at a time into fixed-size buffers, so RAM use doesn't depend on
+# clip length. Files are written on the desktop by anim_convert.py.
+#
+# Layout (big-endian):
+#   header  16 bytes
+#     0..3   magic b"DPA1"
+#     4      width       5  height     (x/y grid the clip was made for)
+#     6      fps         7  bpp        (1 = 1-bit, 8 = palette-indexed,
+#                                         24 = true colour, GRB, no palette)
+#     8..9   frame count
+#     10..11 pixel count (strip length; pixels are stored in strip order)
+#     12..13 largest frame record payload (reader allocates this once)
+#     14     palette entries (0 = 256; none for bpp 24)
+#     15     reserved
+#   palette  entries * 3 bytes RGB
+#   frames   type u8, length u16, payload
+#     FRAME_RAW    packed pixels
+#     FRAME_RLE    run-length (count 1..255, value) pairs of packed pixels
+#     FRAME_DELTA  same RLE of (packed XOR previous packed)
+MAGIC = b"DPA1"
+HEADER_SIZE = 16
+RECORD_HEADER = 3
+
+FRAME_RAW = 0
+FRAME_RLE = 1
+FRAME_DELTA = 2
+
+
+def packed_size(num_pixels, bpp):
+    if bpp == 1:
+        return (num_pixels + 7) // 8
+    return num_pixels * 3 if bpp == 24 else num_pixels
+
+
+# ---- decoding (device + desktop) ---------------------------------------------
+
+def _rle_decode(src, n, dst, xor):
+    """Expand (count, value) pairs from src[:n] into dst (XOR-ing if xor)."""
+    o = 0
+    for i in range(0, n - 1, 2):
+        count = src[i]
+        value = src[i + 1]
+        if xor:
+            if value:
+                for k in range(o, o + count):
+                    dst[k] ^= value
+        else:
+            for k in range(o, o + count):
+                dst[k] = value
+        o += count
+
+
+class AnimReader:
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        head = self._f.read(HEADER_SIZE)
+        if len(head) != HEADER_SIZE or head[0:4] != MAGIC:
+            raise ValueError("not a .dpa animation: " + path)
+        self.width = head[4]
+        self.height = head[5]
+        self.fps = head[6] or 1
+        self.bpp = head[7]
+        self.frame_count = (head[8] << 8) | head[9]
+        self.num_pixels = (head[10] << 8) | head[11]
+        max_record = (head[12] << 8) | head[13]
+        entries = 0 if self.bpp == 24 else (head[14] or 256)
+
+        # palette, pre-swizzled to the strip's GRB order
+        pal = self._f.read(entries * 3)
+        self.palette = bytearray(len(pal))
+        for i in range(0, len(pal), 3):
+            self.palette[i] = pal[i + 1]
+            self.palette[i + 1] = pal[i]
+            self.palette[i + 2] = pal[i + 2]
+
+        self._data_start = HEADER_SIZE + entries * 3
+        self._record = bytearray(max_record)
+        self._record_mv = memoryview(self._record)
+        self._head = bytearray(RECORD_HEADER)
+        self.packed = bytearray(packed_size(self.num_pixels, self.bpp))
+        self.index = -1         # frame currently held in self.packed
+
+    def rewind(self):
+        self._f.seek(self._data_start)
+        self.index = -1
+
+    def next_frame(self):
+        """Decode the next frame into self.packed. Returns False at end of clip."""
+        if self._f.readinto(self._head) != RECORD_HEADER:
+            return False
+        kind = self._head[0]
+        n = (self._head[1] << 8) | self._head[2]
+        self._f.readinto(self._record_mv[:n])
+        if kind == FRAME_RAW:
+            self.packed[:] = self._record_mv[:n]
+        else:
+            _rle_decode(self._record, n, self.packed, kind == FRAME_DELTA)
+        self.index += 1
+        return True
+
+    def blit(self, fb):
+        """Expand the current frame into fb.buf (strip order, GRB)."""
+        buf = fb.buf
+        pal = self.palette
+        packed = self.packed
+        n = min(self.num_pixels, fb.n)
+        if self.bpp == 24:
+            buf[:n * 3] = memoryview(packed)[:n * 3]   # stored in strip byte order already
+        elif self.bpp == 1:
+            on0, on1, on2 = pal[3], pal[4], pal[5]
+            off0, off1, off2 = pal[0], pal[1], pal[2]
+            for i in range(n):
+                o = i * 3
+                if packed[i >> 3] & (0x80 >> (i & 7)):
+                    buf[o] = on0
+                    buf[o + 1] = on1
+                    buf[o + 2] = on2
+                else:
+                    buf[o] = off0
+                    buf[o + 1] = off1
+                    buf[o + 2] = off2
+        else:
+            for i in range(n):
+                o = i * 3
+                p = packed[i] * 3
+                buf[o] = pal[p]
+                buf[o + 1] = pal[p + 1]
+                buf[o + 2] = pal[p + 2]
+
+    def close(self):
+        self._f.close()
+
+
+# ---- encoding (desktop) ---------------------------------------------------------
+
+def _rle_encode(data):
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        v = data[i]
+        run = 1
+        while i + run < n and run < 255 and data[i + run] == v:
+            run += 1
+        out.append(run)
+        out.append(v)
+        i += run
+    return out
+
+
+def pack_pixels(indices, bpp):
+    """
+    Pack per-pixel palette indices (strip order) into the stored form.
+    For bpp=24 the "indices" are (r, g, b) tuples, stored GRB.
+    """
+    if bpp == 8:
+        return bytearray(indices)
+    if bpp == 24:
+        out = bytearray(len(indices) * 3)
+        for i, (r, g, b) in enumerate(indices):
+            o = i * 3
+            out[o] = g
+            out[o + 1] = r
+            out[o + 2] = b
+        return out
+    out = bytearray(packed_size(len(indices), 1))
+    for i, v in enumerate(indices):
+        if v:
+            out[i >> 3] |= 0x80 >> (i & 7)
+    return out
+
+
+class AnimWriter:
+    def __init__(self, path, width, height, fps, bpp, palette):
+        """palette: list of (r, g, b); 2 entries (off, on) for bpp=1, none for bpp=24."""
+        if bpp not in (1, 8, 24):
+            raise ValueError("bpp must be 1, 8 or 24")
+        self.path = path
+        self.width, self.height, self.fps, self.bpp = width, height, fps, bpp
+        self.palette = list(palette)
+        self.records = []
+        self._prev = None
+        self.num_pixels = None
+
+    def add_frame(self, indices):
+        """Append a frame given as palette indices in strip order."""
+        if self.num_pixels is None:
+            self.num_pixels = len(indices)
+        packed = pack_pixels(indices, self.bpp)
+        candidates = [(FRAME_RAW, bytes(packed)), (FRAME_RLE, bytes(_rle_encode(packed)))]
+        if self._prev is not None:
+            delta = bytearray(a ^ b for a, b in zip(packed, self._prev))
+            candidates.append((FRAME_DELTA, bytes(_rle_encode(delta))))
+        self.records.append(min(candidates, key=lambda c: len(c[1])))
+        self._prev = packed
+
+    def close(self):
+        max_record = max((len(p) for _, p in self.records), default=0)
+        entries = len(self.palette)
+        with open(self.path, "wb") as f:
+            f.write(MAGIC + bytes((
+                self.width, self.height, self.fps, self.bpp,
+                len(self.records) >> 8, len(self.records) & 0xFF,
+                self.num_pixels >> 8, self.num_pixels & 0xFF,
+                max_record >> 8, max_record & 0xFF,
+                entries & 0xFF, 0,
+            )))
+            for r, g, b in self.palette:
+                f.write(bytes((r, g, b)))
+            for kind, payload in self.records:
+                f.write(bytes((kind, len(payload) >> 8, len(payload) & 0xFF)))
+                f.write(payload)
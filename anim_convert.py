@@ -0,0 +1,87 @@
+# anim_convert.py — desktop tool: GIF / image sequence -> .dpa animation
+#
+# Usage:
+#   python anim_convert.py clip.gif out.dpa [--fps 30] [--mono] [--colors 16]
+#   python anim_convert.py frames_dir/ out.dpa ...   (PNG/JPG frames, sorted by name)
+#
+# For the README videos, extract frames first, e.g.
+#   ffmpeg -i videos/kitt.mkv -vf fps=30 frames/%05d.png
+#
+# Frames are scaled to the visor grid (layout.COLS x layout.ROWS) and stored
+# in strip order. --mono writes 1-bit frames (Bad Apple); otherwise a global
+# palette of --colors entries is built from the clip. Needs Pillow.
+import argparse
+import os
+
+from PIL import Image, ImageSequence
+
+import anim
+import layout
+
+
+def _frames(src):
+    if os.path.isdir(src):
+        for name in sorted(os.listdir(src)):
+            if name.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif")):
+                with Image.open(os.path.join(src, name)) as im:
+                    yield im.convert("RGB")
+    else:
+        with Image.open(src) as im:
+            for frame in ImageSequence.Iterator(im):
+                yield frame.convert("RGB")
+
+
+def _to_strip(pixels):
+    """Row-major x/y pixel values -> list in strip (wire) order."""
+    out = [0] * layout.NUM_PIXELS
+    for y in range(layout.ROWS):
+        for x in range(layout.COLS):
+            i = layout.XY[y * layout.COLS + x]
+            if i != layout.NONE:
+                out[i] = pixels[y * layout.COLS + x]
+    return out
+
+
+def convert(src, dst, fps=30, mono=False, colors=16, on=(255, 255, 255), threshold=128):
+    size = (layout.COLS, layout.ROWS)
+    frames = [f.resize(size, Image.BOX) for f in _frames(src)]
+    if not frames:
+        raise SystemExit("no frames in " + src)
+
+    if mono:
+        writer = anim.AnimWriter(dst, size[0], size[1], fps, 1, [(0, 0, 0), on])
+        for f in frames:
+            grey = list(f.convert("L").getdata())
+            writer.add_frame(_to_strip([1 if v >= threshold else 0 for v in grey]))
+    else:
+        # one palette for the whole clip, from a strip of all frames
+        sheet = Image.new("RGB", (size[0], size[1] * len(frames)))
+        for n, f in enumerate(frames):
+            sheet.paste(f, (0, n * size[1]))
+        pal_img = sheet.quantize(colors=colors)
+        flat = pal_img.getpalette()[:colors * 3]
+        palette = [tuple(flat[i:i + 3]) for i in range(0, len(flat), 3)]
+        writer = anim.AnimWriter(dst, size[0], size[1], fps, 8, palette)
+        for f in frames:
+            q = f.quantize(palette=pal_img, dither=Image.Dither.NONE)
+            writer.add_frame(_to_strip(list(q.getdata())))
+
+    writer.close()
+    print("wrote", dst, len(frames), "frames,", os.path.getsize(dst), "bytes")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="GIF / image sequence -> .dpa animation")
+    ap.add_argument("src")
+    ap.add_argument("dst")
+    ap.add_argument("--fps", type=int, default=30)
+    ap.add_argument("--mono", action="store_true", help="1-bit frames")
+    ap.add_argument("--colors", type=int, default=16, help="palette size (2..256)")
+    ap.add_argument("--threshold", type=int, default=128, help="mono cut-off 0..255")
+    args = ap.parse_args()
+    convert(args.src, args.dst, fps=args.fps, mono=args.mono, colors=args.colors,
+            threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    main()
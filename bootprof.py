@@ -0,0 +1,65 @@
+# bootprof.py — boot-time profiling (time-to-first-light)
+#
+# Import this first in main.py; every boot phase (module imports, Wi-Fi,
+# socket binds, NTP, first frame) is timestamped with ticks_us relative to
+# that import. report() prints the summary, /boot serves it as JSON.
+import time
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    # Desktop (CPython) fallbacks
+    def ticks_us():
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+_T0 = ticks_us()
+phases = []     # (name, start_us, duration_us); duration 0 for plain marks
+
+
+def now_us():
+    return ticks_diff(ticks_us(), _T0)
+
+
+def mark(name):
+    """Record an instant (e.g. 'first frame')."""
+    phases.append((name, now_us(), 0))
+
+
+class phase:
+    """with bootprof.phase("wifi"): ...  records how long the block took."""
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = now_us()
+        return self
+
+    def __exit__(self, *exc):
+        phases.append((self.name, self.start, now_us() - self.start))
+        return False
+
+
+def load(name):
+    """Import a module by name and record how long the import took."""
+    start = now_us()
+    mod = __import__(name)
+    phases.append(("import " + name, start, now_us() - start))
+    return mod
+
+
+def summary():
+    return [{"phase": name, "at_ms": (start + dur) // 1000, "ms": dur / 1000}
+            for name, start, dur in phases]
+
+
+def report():
+    print("Boot profile (ms since power-on import):")
+    for name, start, dur in phases:
+        end = (start + dur) / 1000
+        if dur:
+            print("  %8.1f  %-24s %7.1f ms" % (end, name, dur / 1000))
+        else:
+            print("  %8.1f  %s" % (end, name))
@@ -1,19 +1,20 @@
 # main.py
 import fivefont as ff
-import starfield
+import layout
+import framebuffer
+from modes import starfield
 import time
 import math
 
-ROWS = 5
-COLS = 21
-# ROW_LENGTHS = (21, 21, 21, , 35)  # top to bottom, adjust to your actual counts
+ROWS = layout.ROWS
+COLS = layout.COLS     # row lengths come from config.ROW_LENGTHS, see layout.py
 
 # Portable setup: Pico on-device vs desktop mock
 try:
     import machine, neopixel, time, random
     IS_PICO = True
     PIN_NUM = 28
-    N_PIX   = ROWS * COLS           # e.g., 7 rows * 17 cols
+    N_PIX   = layout.NUM_PIXELS
     np = neopixel.NeoPixel(machine.Pin(PIN_NUM), N_PIX)
 
 except ImportError:
@@ -68,18 +69,16 @@ except ImportError:
                 return
 
             cols = self.width
-            rows = (self.n + cols - 1) // cols
+            rows = layout.ROWS
             out_lines = []
             for row in range(rows):
                 seg = []
                 for col in range(cols):
-                    idx = row * cols + col
-                    if idx >= self.n:
+                    # Visualize as wired: the layout table knows the serpentine order
+                    wire_idx = layout.index(col, row)
+                    if wire_idx == layout.NONE or wire_idx >= self.n:
                         seg.append(" ")
                         continue
-                    # Map serpentine if requested (visualize as you wired it)
-                    wire_col = (cols - 1 - col) if (self.serpentine and (row % 2 == 1)) else col
-                    wire_idx = row * cols + wire_col
                     r, g, b = self[wire_idx]
                     if (r, g, b) == (0, 0, 0):
                         seg.append(self._off)
@@ -93,7 +92,7 @@ except ImportError:
 
     # Configure your mock for a 7x17 visor (serpentine wiring default)
     PIN_NUM = 28
-    N_PIX   = ROWS * COLS
+    N_PIX   = layout.NUM_PIXELS
     np = MockNeoPixel(MockPin(PIN_NUM), N_PIX, width=COLS, serpentine=True)
 
 def main_loop():
@@ -107,17 +106,17 @@ def main_loop():
 
     if IS_PICO:
         import ntp
-        
+        import webcontrol
+        webcontrol.connect_wifi()
+        ntp.sync()
+
 
     # Clock
     while True:
-        t = time.localtime()  # keep as struct_time, not string
+        t = ntp.localtime() if IS_PICO else time.localtime()
 
         hour = t[3]
 
-        if IS_PICO:
-            hour -= 5
-
         hour = hour % 12
         if hour == 0:
             hour = 12
@@ -170,11 +169,11 @@ def main_loop():
             
     while True:
         # Starfield effect
+        sky = framebuffer.Framebuffer()
         for t in range(0, 1000, 5):
+            starfield.step(sky, {}, t / 100.0)
             for p in range(N_PIX):
-                x, y = pixel_to_xy(p)
-                r, g, b = starfield.starfield_pixel(x * (200 // COLS), y * (200 // ROWS), t / 10.0)
-                np[p] = (r, g, b)
+                np[p] = sky[p]
             np.write()
             time.sleep(0.05)
             
@@ -236,17 +235,11 @@ def side_burns():
 # Map pixel number to x,y
 # The pixels are in a serpintine layout with COLS columns and ROWS rows
 def pixel_to_xy(p):
-    row = p // COLS
-    col = p % COLS
-    if row % 2 == 1:
-        col = COLS - 1 - col
-    return (col, row)
+    return layout.pixel_to_xy(p)
 
 # Map x,y to pixel number
 def xy_to_pixel(x, y):
-    if y % 2 == 1:
-        x = COLS - 1 - x
-    return y * COLS + x
+    return layout.index(x, y)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+# compositor.py — stack effects as layers and blend them into the frame
+#
+# Each Layer owns a preallocated Framebuffer that a mode (or an overlay)
+# draws into. compose() blends the visible layers bottom-up into the output
+# framebuffer, one integer pass over the bytes per layer:
+#
+#   COPY   replace (the bottom layer)
+#   ADD    saturating add (glow, sparks)
+#   MAX    per-channel maximum
+#   ALPHA  mix by layer.alpha (0..255)
+#   OVER   lit pixels replace, black is transparent (text / clock on top)
+#   MASK   stencil: frame pixels are cleared wherever the layer is black
+#
+# OVERLAYS are the effects main.py can put on top of any mode
+# (state["overlay"], /set?overlay=...).
+import framebuffer
+import grid
+
+COPY = 0
+ADD = 1
+MAX = 2
+ALPHA = 3
+OVER = 4
+MASK = 5
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _add(dst, src, n: int):
+        d = ptr8(dst)
+        s = ptr8(src)
+        i = 0
+        while i < n:
+            v = d[i] + s[i]
+            d[i] = v if v < 255 else 255
+            i += 1
+
+    @micropython.viper
+    def _max(dst, src, n: int):
+        d = ptr8(dst)
+        s = ptr8(src)
+        i = 0
+        while i < n:
+            if s[i] > d[i]:
+                d[i] = s[i]
+            i += 1
+
+    @micropython.viper
+    def _alpha(dst, src, n: int, a: int):
+        # a is 0..256
+        d = ptr8(dst)
+        s = ptr8(src)
+        i = 0
+        while i < n:
+            v = d[i]
+            d[i] = v + (((s[i] - v) * a) >> 8)
+            i += 1
+
+    @micropython.viper
+    def _over(dst, src, n: int):
+        d = ptr8(dst)
+        s = ptr8(src)
+        i = 0
+        while i < n:
+            if s[i] | s[i + 1] | s[i + 2]:
+                d[i] = s[i]
+                d[i + 1] = s[i + 1]
+                d[i + 2] = s[i + 2]
+            i += 3
+
+    @micropython.viper
+    def _mask(dst, src, n: int):
+        d = ptr8(dst)
+        s = ptr8(src)
+        i = 0
+        while i < n:
+            if not (s[i] | s[i + 1] | s[i + 2]):
+                d[i] = 0
+                d[i + 1] = 0
+                d[i + 2] = 0
+            i += 3
+except Exception:
+    def _add(dst, src, n):
+        for i in range(n):
+            v = dst[i] + src[i]
+            dst[i] = v if v < 255 else 255
+
+    def _max(dst, src, n):
+        for i in range(n):
+            if src[i] > dst[i]:
+                dst[i] = src[i]
+
+    def _alpha(dst, src, n, a):
+        for i in range(n):
+            v = dst[i]
+            dst[i] = v + (((src[i] - v) * a) >> 8)
+
+    def _over(dst, src, n):
+        for i in range(0, n, 3):
+            if src[i] | src[i + 1] | src[i + 2]:
+                dst[i:i + 3] = src[i:i + 3]
+
+    def _mask(dst, src, n):
+        for i in range(0, n, 3):
+            if not (src[i] | src[i + 1] | src[i + 2]):
+                dst[i] = dst[i + 1] = dst[i + 2] = 0
+
+
+def blend(dst, src, mode, alpha=255):
+    """Blend bytearray src into dst (same length) in place."""
+    n = len(dst)
+    if mode == COPY:
+        dst[:] = src
+    elif mode == ADD:
+        _add(dst, src, n)
+    elif mode == MAX:
+        _max(dst, src, n)
+    elif mode == ALPHA:
+        _alpha(dst, src, n, alpha + (alpha >> 7))     # 255 -> 256: exact at full
+    elif mode == OVER:
+        _over(dst, src, n)
+    elif mode == MASK:
+        _mask(dst, src, n)
+    else:
+        raise ValueError("unknown blend mode %r" % mode)
+
+
+class Layer:
+    def __init__(self, name, blend=COPY, alpha=255):
+        self.name = name
+        self.fb = framebuffer.Framebuffer()
+        self.blend = blend
+        self.alpha = alpha
+        self.visible = True
+
+
+class Compositor:
+    def __init__(self):
+        self.layers = []        # bottom first
+
+    def layer(self, name, blend=COPY, alpha=255):
+        """Return the layer called name, creating it on top if it doesn't exist."""
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        layer = Layer(name, blend, alpha)
+        self.layers.append(layer)
+        return layer
+
+    def remove(self, name):
+        self.layers = [layer for layer in self.layers if layer.name != name]
+
+    def compose(self, fb):
+        """Blend the visible layers into fb; the first one is copied."""
+        first = True
+        for layer in self.layers:
+            if not layer.visible:
+                continue
+            blend(fb.buf, layer.fb.buf, COPY if first else layer.blend, layer.alpha)
+            first = False
+        if first:
+            fb.clear()
+
+
+# ---- overlays: draw(fb, state, t) into a layer blended OVER the mode -------------
+
+def _sideburns(fb, state, t):
+    fb.clear()
+    grid.side_burns(fb)
+
+
+_clock = None
+
+def _clock_face(fb, state, t):
+    global _clock
+    if _clock is None:
+        from modes import clock as _clock   # kept here even when the registry unloads it
+    _clock.step(fb, state, t)
+
+
+OVERLAYS = {
+    "sideburns": _sideburns,
+    "clock": _clock_face,
+}
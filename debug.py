@@ -1,24 +1,49 @@
 # main.py
 import fivefont as ff
 
+import socket
+import sys
 import time
-from modes import grot, rain, text, tron, infinity, kitt, clock, wopr, hal, eqbars, scroll, snow
+import framebuffer
+import layout
+import output
+import scheduler
+import stream
+import modes
 
-ROWS = 5
-COLS = 21
-# ROW_LENGTHS = (21, 21, 21, , 35)  # top to bottom, adjust to your actual counts
+ROWS = layout.ROWS
+COLS = layout.COLS     # row lengths come from config.ROW_LENGTHS, see layout.py
 
 # ===== Mock with ASCII colored circles =====
-class MockNeoPixel(list):
+class MockNeoPixel:
+    # Same byte layout as neopixel.NeoPixel: a flat GRB `buf` in wire order,
+    # so framebuffer.Framebuffer can copy straight into it.
+    ORDER = (1, 0, 2)
+
     def __init__(self, pin, n, *, width=None, serpentine=True):
-        super().__init__([(0, 0, 0)] * n)
         self.n = n
+        self.buf = bytearray(n * 3)
         self.width = width     # e.g., 17
         self.serpentine = serpentine
         self._fg = True        # use colored foreground glyphs
         self._dot = "●"        # full circle (fallback: "o")
         self._off = "·"        # dim dot for (0,0,0)
 
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, i, color):
+        i *= 3
+        self.buf[i] = color[1]
+        self.buf[i + 1] = color[0]
+        self.buf[i + 2] = color[2]
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        i *= 3
+        return (self.buf[i + 1], self.buf[i], self.buf[i + 2])
+
     # ANSI truecolor helpers
     @staticmethod
     def _ansi_rgb(r, g, b, gamma=0.1):
@@ -56,18 +81,16 @@ class MockNeoPixel(list):
             return
 
         cols = self.width
-        rows = (self.n + cols - 1) // cols
+        rows = layout.ROWS
         out_lines = []
         for row in range(rows):
             seg = []
             for col in range(cols):
-                idx = row * cols + col
-                if idx >= self.n:
+                # Visualize as wired: the layout table knows the serpentine order
+                wire_idx = layout.index(col, row)
+                if wire_idx == layout.NONE or wire_idx >= self.n:
                     seg.append(" ")
                     continue
-                # Map serpentine if requested (visualize as you wired it)
-                wire_col = (cols - 1 - col) if (self.serpentine and (row % 2 == 1)) else col
-                wire_idx = row * cols + wire_col
                 r, g, b = self[wire_idx]
                 if (r, g, b) == (0, 0, 0):
                     seg.append(self._off)
@@ -75,43 +98,57 @@ class MockNeoPixel(list):
                     seg.append(self._ansi_rgb(r, g, b) + self._dot + self._reset())
             out_lines.append(" ".join(seg))
         print("\n".join(out_lines))
+        print("~%d mA" % output.estimate_ma(self.buf))
         print()
 
-N_PIX   = ROWS * COLS
+N_PIX   = layout.NUM_PIXELS
 np = MockNeoPixel(0, N_PIX, width=COLS, serpentine=True)
+fb = framebuffer.Framebuffer(np)
+out = output.Output(np)     # same brightness / gamma / power limiter as main.py
 
-def main_loop():
-
-    ff.draw_text(np, COLS, ROWS, "HELLO", color=(55, 55, 55), spacing=1, serpentine=True)
-    np.write()
+def main_loop(stream_to=None, mode="wopr"):
+    # stream_to = helmet IP: also send every frame to it over DDP (stream.py)
+    sender = None
+    if stream_to:
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    seq = 0
 
     state = {
+        "mode": mode,
         "text": "DAFT PUNK HELMET DEMO ",
         "color": (0, 100, 100),
     }
 
+    ff.draw_text(fb, COLS, ROWS, "HELLO", color=(55, 55, 55), spacing=1, serpentine=True)
+    out.write(fb, state, "boot")
+    registry = modes.Registry(modes.available())
+
+    frames = scheduler.FrameScheduler(10)
+    report_every = frames.fps_target * 5
     while True:
         t = time.time()  # keep as struct_time, not string
 
-        wopr.step(np, state, t)
+        registry.get(mode, state).step(fb, state, t)
+        out.write(fb, state, mode)
+        if sender:
+            seq = seq % 15 + 1
+            sender.sendto(stream.pack(fb.buf, seq=seq), (stream_to, stream.PORT))
 
-        time.sleep(0.1)
+        frames.wait()
+        if frames.frames % report_every == 0:
+            print("Power:", out.report())
 # Map pixel number to x,y
 # The pixels are in a serpintine layout with COLS columns and ROWS rows
 def pixel_to_xy(p):
-    row = p // COLS
-    col = p % COLS
-    if row % 2 == 1:
-        col = COLS - 1 - col
-    return (col, row)
+    return layout.pixel_to_xy(p)
 
 # Map x,y to pixel number
 def xy_to_pixel(x, y):
-    if y % 2 == 1:
-        x = COLS - 1 - x
-    return y * COLS + x
+    return layout.index(x, y)
 
 
 if __name__ == "__main__":
-    main_loop()
+    # python debug.py [helmet-ip] [mode]
+    main_loop(sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] != "-" else None,
+              sys.argv[2] if len(sys.argv) > 2 else "wopr")
     
\ No newline at end of file
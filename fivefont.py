@@ -1,5 +1,6 @@
 # fivefont.py — 3x5 font + renderer for 5-row LED matrices
 import time
+import layout
 
 # 3x5 glyphs stored column-wise (width ≤3, height = 5).
 # Each glyph is a tuple of columns; each column is a 5-bit int (LSB = row 0 / top).
@@ -55,14 +56,19 @@ FONT_3x5 = {
     "Z": (0b11001,0b10101,0b10011),
 }
 
-# Optional gamma/log LUT hook (identity by default)
-LUT = list(range(256))
+# Optional per-text colour LUT hook (identity by default). Global brightness
+# and gamma are applied to the whole frame in output.py — don't stack them here.
+LUT = bytearray(range(256))
 def map_rgb(r,g,b,lut=LUT): return (lut[r], lut[g], lut[b])
 
 def pixel_index(x:int, y:int, width:int, height:int, serpentine=True) -> int:
     """Map (x,y) -> linear index for serpentine-wired rows; y=0 is top."""
     if not (0 <= x < width and 0 <= y < height):
         return -1
+    if width == layout.COLS and height == layout.ROWS and serpentine == layout.SERPENTINE:
+        # the visor itself: single lookup in the precomputed table
+        idx = layout.XY[y * width + x]
+        return -1 if idx == layout.NONE else idx
     if serpentine and (y % 2 == 1):
         x = width - 1 - x
     return y * width + x
@@ -85,27 +91,77 @@ def draw_char(np, width, height, x0, ch, color=(255,255,255), spacing=1, serpent
     # spacing column left blank
     return gw + spacing
 
+# ---- compiled text --------------------------------------------------------
+# A string is compiled once into a bytearray of 5-bit columns (same bit
+# order as the glyphs, trailing spacing dropped). Redraws and scroll steps
+# are then a slice over those columns. Recently used strings are kept in a
+# small LRU cache keyed by (text, spacing).
+
+CACHE_SIZE = 8
+_cache = {}
+_cache_order = []   # least recently used first
+
+def compile_text(text, spacing=1):
+    """Return the packed column bitmap for text (cached)."""
+    key = (text, spacing)
+    cols = _cache.get(key)
+    if cols is not None:
+        if _cache_order[-1] != key:
+            _cache_order.remove(key)
+            _cache_order.append(key)
+        return cols
+
+    cols = bytearray()
+    for ch in text:
+        for colbits in FONT_3x5.get(ch.upper(), FONT_3x5[" "]):
+            cols.append(colbits)
+        for _ in range(spacing):
+            cols.append(0)
+    if text and spacing:
+        cols = cols[:-spacing]  # remove trailing space
+
+    _cache[key] = cols
+    _cache_order.append(key)
+    if len(_cache_order) > CACHE_SIZE:
+        del _cache[_cache_order.pop(0)]
+    return cols
+
+def text_width(text, spacing=1):
+    return len(compile_text(text, spacing))
+
+def blit_columns(np, width, height, cols, x0, color=(255,255,255), serpentine=True):
+    """Draw compiled columns with cols[0] at screen column x0; only visible columns are touched."""
+    if height != 5:
+        raise ValueError("This renderer expects height=5.")
+    rgb = map_rgb(*color)
+    first = -x0 if x0 < 0 else 0
+    last = width - x0
+    if last > len(cols):
+        last = len(cols)
+    for i in range(first, last):
+        colbits = cols[i]
+        if not colbits:
+            continue
+        x = x0 + i
+        for y in range(5):        # y=0 top row bit0
+            if (colbits >> y) & 1:
+                idx = pixel_index(x, y, width, height, serpentine)
+                if idx >= 0:
+                    np[idx] = rgb
+
 def draw_text(np, width, height, text, x_start=None, color=(255,255,255), spacing=1, serpentine=True):
     """
     Draw text horizontally centered (if x_start=None) or starting at x_start.
     Returns total pixel width of the rendered text.
     """
-    # measure text width first
-    text_width = 0
-    for ch in text:
-        glyph = FONT_3x5.get(ch.upper(), ())
-        text_width += len(glyph) + spacing
-    if text_width > 0:
-        text_width -= spacing  # remove trailing space
+    cols = compile_text(text, spacing)
+    text_width = len(cols)
 
     # if no explicit start, center horizontally
     if x_start is None:
         x_start = (width - text_width) // 2
 
-    # now draw
-    x = x_start
-    for ch in text:
-        x += draw_char(np, width, height, x, ch, color=color, spacing=spacing, serpentine=serpentine)
+    blit_columns(np, width, height, cols, x_start, color=color, serpentine=serpentine)
     return text_width
 
 def draw_text_window(np, width, height, text, window_x, color=(255,255,255), spacing=1, serpentine=True):
@@ -114,18 +170,52 @@ def draw_text_window(np, width, height, text, window_x, color=(255,255,255), spa
     Example: call with window_x increasing to scroll left.
     """
     # Clear frame
-    for i in range(width*height):
-        np[i] = (0,0,0)
-    # Compute total text width so we can stop early if desired
-    tw = 0
-    for ch in text:
-        tw += len(FONT_3x5.get(ch.upper(), ())) + spacing
+    np.fill((0,0,0))
+    cols = compile_text(text, spacing)
     # Draw with negative start so left edge is at -window_x
-    x0 = -window_x
-    x = x0
-    for ch in text:
-        x += draw_char(np, width, height, x, ch, color=color, spacing=spacing, serpentine=serpentine)
-    return tw
+    blit_columns(np, width, height, cols, -window_x, color=color, serpentine=serpentine)
+    # total text width including the trailing space, so callers can stop early
+    return len(cols) + spacing if text else 0
+
+class Scroller:
+    """
+    Non-blocking marquee: call step() once per frame with the elapsed time t
+    (seconds). The text enters from off-screen right and leaves off-screen
+    left at `speed` columns per second, then loops or stops (done=True).
+    """
+    def __init__(self, text, color=(255, 255, 255), speed=25, spacing=1,
+                 loop=True, width=layout.COLS, height=5, serpentine=True):
+        self.text = text
+        self.color = color
+        self.speed = speed
+        self.spacing = spacing
+        self.loop = loop
+        self.width = width
+        self.height = height
+        self.serpentine = serpentine
+        self.reset()
+
+    def reset(self):
+        self._t0 = None     # latched on the first step
+        self.done = False
+
+    def step(self, np, t):
+        """Render the frame for time t. Returns False once a non-looping scroll has finished."""
+        if self._t0 is None or t < self._t0:
+            self._t0 = t    # first step, or the show clock went backwards
+        cols = compile_text(self.text, self.spacing)
+        # window offset runs from -width (all blank) to +tw (fully exited)
+        span = self.width + len(cols) + self.spacing + 1
+        pos = int((t - self._t0) * self.speed)
+        if pos >= span:
+            if self.loop:
+                pos %= span
+            else:
+                pos = span - 1
+                self.done = True
+        draw_text_window(np, self.width, self.height, self.text, pos - self.width,
+                         color=self.color, spacing=self.spacing, serpentine=self.serpentine)
+        return not self.done
 
 def scroll_text(np, width, height, text,
                 color=(255, 255, 255),
@@ -137,6 +227,7 @@ def scroll_text(np, width, height, text,
                 sleep_fn=None):
     """
     Simple blocking marquee: scrolls text from off-screen right to off-screen left.
+    Don't call this from a mode's step() — use Scroller there instead.
     - Starts with an empty window (text fully off to the right),
       scrolls in, then fully off to the left.
     - write_fn: function to flush (defaults to np.write if present, else no-op).
@@ -145,9 +236,7 @@ def scroll_text(np, width, height, text,
     import time
 
     # total text width in columns
-    tw = 0
-    for ch in text:
-        tw += len(FONT_3x5.get(ch.upper(), ())) + spacing
+    tw = len(compile_text(text, spacing)) + spacing if text else 0
 
     window = width  # visible window width
 
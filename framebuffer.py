@@ -0,0 +1,117 @@
+# framebuffer.py — one preallocated GRB frame that modes draw into
+#
+# The byte layout matches neopixel.NeoPixel.buf (GRB, strip/wire order), so
+# pushing a frame to the strip is a single slice copy instead of 105 tuple
+# writes. Modes draw with x/y helpers; nothing here allocates per pixel.
+from layout import XY, NONE
+import layout
+
+
+class Framebuffer:
+    def __init__(self, strip=None):
+        self.strip = strip          # neopixel.NeoPixel (or debug.MockNeoPixel)
+        self.width = layout.COLS
+        self.height = layout.ROWS
+        self.n = layout.NUM_PIXELS
+        self.buf = bytearray(self.n * 3)
+        self._mv = memoryview(self.buf)
+
+    # ---- whole-frame ops --------------------------------------------------
+
+    def clear(self):
+        mv = self._mv
+        mv[0] = 0
+        self._spread(1)
+
+    def fill(self, color):
+        mv = self._mv
+        mv[0] = color[1]
+        mv[1] = color[0]
+        mv[2] = color[2]
+        self._spread(3)
+
+    def _spread(self, size):
+        # doubling copy of the first `size` bytes over the whole buffer
+        mv = self._mv
+        total = len(self.buf)
+        while size < total:
+            k = size if size * 2 <= total else total - size
+            mv[size:size + k] = mv[0:k]
+            size += k
+
+    def copy_from(self, other):
+        self._mv[:] = other.buf
+
+    # ---- pixel ops ----------------------------------------------------------
+
+    def set(self, x, y, color):
+        """Set pixel (x, y) to an (r, g, b) color; off-grid writes are ignored."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = XY[y * self.width + x]
+            if i == NONE:
+                return
+            i *= 3
+            buf = self.buf
+            buf[i] = color[1]
+            buf[i + 1] = color[0]
+            buf[i + 2] = color[2]
+
+    def set_rgb(self, x, y, r, g, b):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = XY[y * self.width + x]
+            if i == NONE:
+                return
+            i *= 3
+            buf = self.buf
+            buf[i] = g
+            buf[i + 1] = r
+            buf[i + 2] = b
+
+    def get(self, x, y):
+        i = layout.index(x, y)
+        if i == NONE:
+            return (0, 0, 0)
+        i *= 3
+        buf = self.buf
+        return (buf[i + 1], buf[i], buf[i + 2])
+
+    def hline(self, y, color, x0=0, x1=None):
+        """Horizontal line on row y from x0 up to (not including) x1."""
+        if x1 is None:
+            x1 = self.width
+        for x in range(x0, x1):
+            self.set(x, y, color)
+
+    def vline(self, x, color, y0=0, y1=None):
+        """Vertical line on column x from y0 up to (not including) y1."""
+        if y1 is None:
+            y1 = self.height
+        for y in range(y0, y1):
+            self.set(x, y, color)
+
+    # Strip-index access, so code written against np[i] keeps working
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, i, color):
+        i *= 3
+        buf = self.buf
+        buf[i] = color[1]
+        buf[i + 1] = color[0]
+        buf[i + 2] = color[2]
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        i *= 3
+        buf = self.buf
+        return (buf[i + 1], buf[i], buf[i + 2])
+
+    # ---- output ----------------------------------------------------------------
+
+    def write(self):
+        """Copy the frame into the strip's own buffer and latch it."""
+        strip = self.strip
+        if strip is not None:
+            strip.buf[:] = self.buf
+            strip.write()
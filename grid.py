@@ -1,17 +1,20 @@
 import config
+import layout
 
-def side_burns(np):
+def side_burns(fb):
     # side burns
     for x in [0, 1, 2, config.COLS - 3, config.COLS - 2, config.COLS - 1]:
-        np[xy_to_pixel(x, 0)] = (20, 0, 0)
-        np[xy_to_pixel(x, 1)] = (10, 10, 0)
-        np[xy_to_pixel(x, 2)] = (0, 20, 0)
-        np[xy_to_pixel(x, 3)] = (0, 0, 20)
-        np[xy_to_pixel(x, 4)] = (0, 0, 20)
+        fb.set(x, 0, (20, 0, 0))
+        fb.set(x, 1, (10, 10, 0))
+        fb.set(x, 2, (0, 20, 0))
+        fb.set(x, 3, (0, 0, 20))
+        fb.set(x, 4, (0, 0, 20))
         # np.write()
 
-# Map x,y to pixel number
+# Map x,y to pixel number (precomputed serpentine table, see layout.py)
 def xy_to_pixel(x, y):
-    if y % 2 == 1:
-        x = config.COLS - 1 - x
-    return y * config.COLS + x
\ No newline at end of file
+    return layout.XY[y * layout.COLS + x]
+
+# Map pixel number to x,y
+def pixel_to_xy(p):
+    return (layout.PX[p], layout.PY[p])
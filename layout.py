@@ -0,0 +1,53 @@
+# layout.py — x/y <-> strip index tables for the visor, built once at import
+#
+# The strip snakes back and forth (serpentine): even rows run left->right,
+# odd rows right->left. Rows may have different lengths (config.ROW_LENGTHS,
+# top to bottom); shorter rows are centred under the widest one and the
+# x/y cells with no LED behind them map to NONE.
+#
+#   XY[y * COLS + x] -> strip index (or NONE)
+#   PX[i], PY[i]     -> x, y of strip index i
+from array import array
+import config
+
+ROWS = config.ROWS
+ROW_LENGTHS = tuple(getattr(config, "ROW_LENGTHS", (config.COLS,) * ROWS))
+COLS = max(ROW_LENGTHS)            # width of the x/y grid
+NUM_PIXELS = sum(ROW_LENGTHS)
+SERPENTINE = getattr(config, "SERPENTINE", True)
+
+NONE = 0xFFFF
+
+
+def _build():
+    xy = array("H", (NONE for _ in range(ROWS * COLS)))
+    px = bytearray(NUM_PIXELS)
+    py = bytearray(NUM_PIXELS)
+    i = 0
+    for y in range(ROWS):
+        length = ROW_LENGTHS[y]
+        offset = (COLS - length) // 2
+        for k in range(length):
+            if SERPENTINE and y % 2 == 1:
+                x = offset + length - 1 - k
+            else:
+                x = offset + k
+            xy[y * COLS + x] = i
+            px[i] = x
+            py[i] = y
+            i += 1
+    return xy, px, py
+
+
+XY, PX, PY = _build()
+
+
+def index(x, y):
+    """Strip index for (x, y), or NONE when off-grid / no LED there."""
+    if 0 <= x < COLS and 0 <= y < ROWS:
+        return XY[y * COLS + x]
+    return NONE
+
+
+def pixel_to_xy(i):
+    return (PX[i], PY[i])
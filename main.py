@@ -1,16 +1,38 @@
 # main.py — tiny glue: Wi-Fi + web + a placeholder animation loop
-import time
-import machine
-import neopixel
-import os
+#
+# Runs on (u)asyncio: the HTTP server and the render loop are separate tasks
+# sharing `state`, so frame timing never waits on a network client.
+# On the desktop (no machine/neopixel) it renders through debug.MockNeoPixel.
+#
+# Boot phases are timestamped by bootprof (imported first): the summary is
+# printed after the first frame and served at /boot.
+import bootprof
 
-import webcontrol
-# import badapple_frames # throws memoery error :(
+try:
+    asyncio = bootprof.load("asyncio")
+except ImportError:
+    asyncio = bootprof.load("uasyncio")
+
+config = bootprof.load("config")
+framebuffer = bootprof.load("framebuffer")
+compositor = bootprof.load("compositor")
+modes = bootprof.load("modes")
+layout = bootprof.load("layout")
+output = bootprof.load("output")
+scheduler = bootprof.load("scheduler")
+transitions = bootprof.load("transitions")
+stream = bootprof.load("stream")
+udpcontrol = bootprof.load("udpcontrol")
+webcontrol = bootprof.load("webcontrol")
+grid = bootprof.load("grid")
+ntp = bootprof.load("ntp")
+from scheduler import ticks_ms, ticks_add, ticks_diff
+# long clips (badapple): anim_convert.py -> .dpa file, played by modes/anim.py
 
 # Runtime state (kept here to keep things minimal)
 state = {
     "mode": "clock",
-    "brightness": 0.4,
+    "brightness": 1.0,      # output.py LUT; modes' colours are already dimmed
     "text": "words",
     "color": (150, 0, 0),
 }
@@ -18,8 +40,22 @@ state = {
 # Hardware (adjust to your pins/layout)
 ROWS, COLS = 5, 21
 PIN_LED = 28
-NUM = ROWS * COLS
-np = neopixel.NeoPixel(machine.Pin(PIN_LED), NUM)
+NUM = layout.NUM_PIXELS
+try:
+    import machine, neopixel
+    np = neopixel.NeoPixel(machine.Pin(PIN_LED), NUM)
+except ImportError:
+    from debug import MockNeoPixel
+    np = MockNeoPixel(PIN_LED, NUM, width=layout.COLS)
+fb = framebuffer.Framebuffer(np)
+out = output.Output(np)     # brightness / gamma / limiter, once per frame
+bootprof.mark("strip ready")
+
+def first_light():
+    """Side burns on the strip before any network work, so boot is visibly alive."""
+    grid.side_burns(fb)
+    out.write(fb, state, "boot")
+    bootprof.mark("first light")
 
 def fill_color(rgb):
     for i in range(NUM):
@@ -36,43 +72,136 @@ def demo_frame(t):
         # fallback
         from modes import clock as mode_module
         mode_func = mode_module.step
-    mode_func(np, state, t)
+    mode_func(fb, state, t)
 
-def main():
-    # wlan = webcontrol.connect_wifi()   # ok if None
-    # sock = None
-    #if wlan:
-    #    sock = webcontrol.create_server()
-
-    # discover the modes in the modes directory
-    files = os.listdir("modes")
-    available_modes = [f[:-3] for f in files if f.endswith(".py") and f != "__init__.py"]
-
-    modes_map = {}
-
-    for name in available_modes:
-        try:
-            # Import as: modes.clock  -> returns the submodule object
-            mod = __import__("modes." + name, None, None, (name,))
-            modes_map[name] = mod
-        except Exception as e:
-            print("Error importing mode", name, e)
-    print("Available modes:", available_modes)
+ddp = None          # DDP receiver, bound by net_up() once the network is there
+servers_up = False
+
+async def render(registry):
+    frames = scheduler.FrameScheduler(getattr(config, "FPS", 30))
+    report_every = frames.fps_target * 5
 
+    drawn_mode = None       # STATIC modes are only stepped when these change
+    drawn_rev = -1
+    drawn_to = None
+    static_skips = 0
 
-    t0 = time.ticks_ms()
+    # with an overlay the mode draws into its own layer and the two are composited
+    comp = compositor.Compositor()
+    base = comp.layer("mode")
+    top = comp.layer("overlay", compositor.OVER)
+
+    # on a mode switch the old and new mode render here and are mixed into the target
+    fade = None
+    fade_from = None
+    old_fb = framebuffer.Framebuffer()
+    new_fb = framebuffer.Framebuffer()
+
+    t0 = last = ticks_ms()
     while True:
-        # 1) serve one HTTP request (if server exists)
-        webcontrol.serve_once(state, available_modes=available_modes)
-
-        # 2) draw one frame
-        t = (time.ticks_diff(time.ticks_ms(), t0) / 1000.0)
-        modes_map[state["mode"]].step(np, state, t)
-
-        # 3) small delay (~30 FPS)
-        # print a . with no newline to show we're alive
-        print(".", end="")
-        time.sleep_ms(10)
-        
+        # 1) apply pending UDP control packets (mode/colour/... within one frame)
+        udpcontrol.poll(state, registry)
+        if "sync_ms" in state:
+            # show controller says "it's now sync_ms into the show"
+            t0 = ticks_add(ticks_ms(), -state.pop("sync_ms"))
+            # t may have jumped backwards: restart time-dependent mode state
+            registry.reset(state)
+            drawn_mode = None
+
+        # 2) draw one frame; a live host stream (DDP) replaces the local mode
+        source = None
+        now = ticks_ms()
+        t = (ticks_diff(now, t0) / 1000.0)
+        dt = ticks_diff(now, last)
+        last = now
+        overlay = compositor.OVERLAYS.get(state.get("overlay"))
+        target = fb if overlay is None else base.fb
+        if ddp is not None and ddp.poll(target):
+            source = "stream"
+            drawn_mode = None
+            if fade is not None:
+                registry.release(state)
+                fade = fade_from = None
+        else:
+            kind = state.get("transition", getattr(config, "TRANSITION", transitions.DEFAULT_KIND))
+            # imports on first use; the old mode is held while a transition runs
+            mode = registry.get(state["mode"], state, hold=kind != "cut")
+            if registry.name != state["mode"]:
+                state["mode"] = registry.name             # unknown/broken mode -> default
+            if registry.prev is not None and registry.prev is not fade_from:
+                fade = transitions.Transition(kind, state.get("transition_ms", transitions.DEFAULT_MS))
+                fade_from = registry.prev
+            rev = state.get("rev", 0)
+            if fade is not None:
+                registry.prev.step(old_fb, state, t)
+                mode.step(new_fb, state, t)
+                fade.advance(dt)
+                fade.mix(target, old_fb, new_fb)
+                if fade.done:
+                    registry.release(state)
+                    fade = fade_from = None
+                    drawn_mode = None     # the next frame draws straight into the target
+            elif (mode is drawn_mode and rev == drawn_rev and target is drawn_to
+                    and getattr(mode, "STATIC", False)):
+                static_skips += 1     # frame in the target is still current
+            else:
+                mode.step(target, state, t)
+                drawn_mode, drawn_rev, drawn_to = mode, rev, target
+        if overlay is not None:
+            overlay(top.fb, state, t)
+            comp.compose(fb)
+        out.write(fb, state, source)
+        if frames.frames == 0:
+            bootprof.mark("first frame")
+            bootprof.report()
+
+        # 3) sleep out whatever is left of this frame's budget (web server runs meanwhile)
+        await frames.wait_async()
+        if frames.frames % report_every == 0:
+            print("Frames:", state["mode"], frames.stats(), "static skips:", static_skips)
+            print("Power:", out.report())
+
+async def net_up(available_modes, wlan):
+    """Called by the Wi-Fi task after every (re)connect; starts the servers the first time."""
+    global ddp, servers_up
+    bootprof.mark("wifi up")
+    if servers_up:
+        return      # sockets on 0.0.0.0 and the NTP task survive a reconnect
+    servers_up = True
+    if wlan is not None:
+        asyncio.create_task(ntp.sync_task())    # desktop: the system clock is already right
+    with bootprof.phase("bind http"):
+        await webcontrol.start_server(state, available_modes, port=getattr(config, "HTTP_PORT", 80))
+    with bootprof.phase("bind udp"):
+        udpcontrol.start(getattr(config, "UDP_PORT", 4210))
+    if getattr(config, "STREAM", True):
+        with bootprof.phase("bind ddp"):
+            ddp = stream.DdpReceiver(getattr(config, "STREAM_PORT", stream.PORT),
+                                     getattr(config, "STREAM_TIMEOUT_MS", 1000))
+    bootprof.report()
+
+async def run():
+    state["power"] = out        # /power reads the estimator's report
+    state["boot"] = bootprof    # /boot reads the phase timings
+    first_light()
+
+    # discover the modes in the modes directory (imported lazily on selection)
+    with bootprof.phase("mode scan"):
+        available_modes = modes.available()
+    registry = modes.Registry(available_modes)
+    print("Available modes:", available_modes)
+
+    # the network comes up in the background; the helmet animates meanwhile
+    async def on_up(wlan):
+        await net_up(available_modes, wlan)
+    asyncio.create_task(webcontrol.wifi_task(state, on_up))
+
+    with bootprof.phase("load mode " + state["mode"]):
+        registry.get(state["mode"], state)
+    await render(registry)
+
+def main():
+    asyncio.run(run())
+
 if __name__ == "__main__":
     main()
@@ -5,6 +5,7 @@ import neopixel
 import os
 
 from modes import clock, grot, rain, text, tron
+import framebuffer
 import webcontrol
 
 # Runtime state (kept here to keep things minimal)
@@ -20,6 +21,7 @@ ROWS, COLS = 5, 21
 PIN_LED = 28
 NUM = ROWS * COLS
 np = neopixel.NeoPixel(machine.Pin(PIN_LED), NUM)
+fb = framebuffer.Framebuffer(np)
 
 def fill_color(rgb):
     for i in range(NUM):
@@ -36,13 +38,11 @@ def demo_frame(t):
         # fallback
         from modes import clock as mode_module
         mode_func = mode_module.step
-    mode_func(np, state, t)
+    mode_func(fb, state, t)
 
 def main():
-    # wlan = webcontrol.connect_wifi()   # ok if None
-    # sock = None
-    #if wlan:
-    #    sock = webcontrol.create_server()
+    webcontrol.connect_wifi()   # ok if None (no Wi-Fi)
+    webcontrol.create_server()
 
     # discover the modes in the modes directory
     files = os.listdir("modes")
@@ -67,7 +67,8 @@ def main():
 
         # 2) draw one frame
         t = (time.ticks_diff(time.ticks_ms(), t0) / 1000.0)
-        modes_map[state["mode"]].step(np, state, t)
+        modes_map[state["mode"]].step(fb, state, t)
+        fb.write()
 
         # 3) small delay (~30 FPS)
         # print a . with no newline to show we're alive
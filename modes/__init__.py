@@ -0,0 +1,120 @@
+# modes/__init__.py — lazy mode registry
+#
+# Nothing in modes/ is imported at boot: available() only lists the files.
+# A mode is imported the first time it is selected; switching away calls its
+# optional teardown(state), drops it from sys.modules and runs gc.collect(),
+# so only one mode's bytecode and globals are resident at a time. A mode may
+# also define init(state), called right after it is imported.
+#
+# During a transition the outgoing mode is held (get(..., hold=True)) so it
+# can keep rendering until release() unloads it.
+#
+# reset(state) restarts the loaded mode in place (teardown, then init), e.g.
+# when a show sync moves the clock backwards.
+import gc
+import os
+import sys
+
+DEFAULT = "clock"
+
+
+def available(path="modes"):
+    """Mode names (modes/*.py), without importing anything."""
+    return sorted(f[:-3] for f in os.listdir(path)
+                  if f.endswith(".py") and f != "__init__.py")
+
+
+class Registry:
+    def __init__(self, names, default=DEFAULT):
+        self.names = names
+        self.default = default
+        self.name = None        # currently loaded mode
+        self.module = None
+        self.prev_name = None   # outgoing mode held for a transition
+        self.prev = None
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def get(self, name, state, hold=False):
+        """
+        Return the module for `name`, loading it if needed. The previous mode is
+        unloaded, or with hold=True kept in self.prev until release().
+        """
+        if name == self.name:
+            return self.module
+        if hold and self.module is not None:
+            self.release(state)
+            self.prev_name, self.prev = self.name, self.module
+            self.name = None
+            self.module = None
+        else:
+            self.unload(state)
+        if name in self.names:
+            try:
+                return self._load(name, state)
+            except Exception as e:
+                print("Error importing mode", name, e)
+                self._forget(name)
+        return self._load(self.default, state)
+
+    def _load(self, name, state):
+        mod = __import__("modes." + name, None, None, (name,))
+        init = getattr(mod, "init", None)
+        if init:
+            init(state)
+        self.name = name
+        self.module = mod
+        print("Loaded mode", name, "free:", _mem_free())
+        return mod
+
+    def unload(self, state):
+        if self.module is None:
+            return
+        self._drop(self.name, self.module, state)
+        self.name = None
+        self.module = None
+        gc.collect()
+
+    def release(self, state):
+        """Unload the mode held for a transition (if any)."""
+        if self.prev is None:
+            return
+        if self.prev is not self.module:
+            self._drop(self.prev_name, self.prev, state)
+        self.prev_name = None
+        self.prev = None
+        gc.collect()
+
+    def reset(self, state):
+        """Restart the loaded (and held) mode: teardown(state), then init(state)."""
+        for name, module in ((self.name, self.module), (self.prev_name, self.prev)):
+            if module is None:
+                continue
+            try:
+                teardown = getattr(module, "teardown", None)
+                if teardown:
+                    teardown(state)
+                init = getattr(module, "init", None)
+                if init:
+                    init(state)
+            except Exception as e:
+                print("Error resetting mode", name, e)
+
+    def _drop(self, name, module, state):
+        teardown = getattr(module, "teardown", None)
+        if teardown:
+            try:
+                teardown(state)
+            except Exception as e:
+                print("Error in teardown of", name, e)
+        self._forget(name)
+
+    @staticmethod
+    def _forget(name):
+        sys.modules.pop("modes." + name, None)
+        globals().pop(name, None)   # the package attribute set by the import
+
+
+def _mem_free():
+    return gc.mem_free() if hasattr(gc, "mem_free") else None
@@ -0,0 +1,64 @@
+# modes/anim.py — play a pre-rendered .dpa clip streamed from flash
+#
+# state["anim"] picks the file (default "anim.dpa"); make one on the desktop
+# with anim_convert.py and copy it to the Pico. Frames are decoded one at a
+# time into fixed buffers (see anim.py), so any clip length fits in RAM.
+import anim
+
+DEFAULT_FILE = "anim.dpa"
+MAX_DECODE_PER_STEP = 4     # frames we may decode to catch up in one step
+
+_reader = None
+_path = None
+_t0 = None
+
+
+def _open(path):
+    global _reader, _path, _t0
+    if _reader is not None:
+        _reader.close()
+    _reader = None
+    _path = path
+    _t0 = None
+    try:
+        _reader = anim.AnimReader(path)
+    except (OSError, ValueError) as e:
+        print("anim: can't open", path, e)
+
+
+def teardown(state):
+    # close the clip when the registry unloads this mode (or resets it)
+    global _reader, _path, _t0
+    if _reader is not None:
+        _reader.close()
+    _reader = None
+    _path = None
+    _t0 = None
+
+
+def step(fb, state, t):
+    global _t0
+    path = state.get("anim", DEFAULT_FILE)
+    if path != _path:
+        _open(path)
+    if _reader is None:
+        fb.clear()
+        return
+
+    if _t0 is None:
+        _t0 = t
+    target = int((t - _t0) * _reader.fps)
+    if target < 0 or target >= _reader.frame_count:
+        # loop the clip (or restart after the show clock was re-synced)
+        _t0 = t
+        target = 0
+    if target < _reader.index:
+        _reader.rewind()
+
+    # decode forward to the frame for this time (delta frames need every step)
+    for _ in range(MAX_DECODE_PER_STEP):
+        if _reader.index >= target:
+            break
+        if not _reader.next_frame():
+            break
+    _reader.blit(fb)
@@ -1,14 +1,13 @@
 # modes/discovery.py
 import config
-import grid
 
-def step(np, state, t):
+STATIC = True   # frame only changes with state (see main.py)
+
+def step(fb, state, t):
     # discovery = 4 red lines
-    np.fill((0,0,0))
+    fb.clear()
     for c in range(config.COLS):
-        np[grid.xy_to_pixel(c, 0)] = (150,0,0)
-        np[grid.xy_to_pixel(c, 1)] = (150,0,0)
-        np[grid.xy_to_pixel(c, 3)] = (150,0,0)
-        np[grid.xy_to_pixel(c, 4)] = (150,0,0)
-
-    np.write()
+        fb.set(c, 0, (150,0,0))
+        fb.set(c, 1, (150,0,0))
+        fb.set(c, 3, (150,0,0))
+        fb.set(c, 4, (150,0,0))
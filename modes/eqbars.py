@@ -1,6 +1,5 @@
 # modes/eqbars.py
 import config
-import grid
 import math
 
 colors_bars = [
@@ -12,9 +11,9 @@ colors_bars = [
 
 ]
 
-def step(np, state, t):
+def step(fb, state, t):
     # tron = 3 blue lines in middle rows
-    np.fill((0,0,0))
+    fb.clear()
 
     height = round((math.sin(t*10) + 1) / 2 * (config.ROWS))
     # print(height)
@@ -26,6 +25,4 @@ def step(np, state, t):
         height = round((math.sin(t/2 * block) + 1) / 2 * (config.ROWS))
         for r in range(int(height)):
 
-            np[grid.xy_to_pixel(c, (config.ROWS-1) - r)] = colors_bars[r] # (0,0,150)
-
-    np.write()
+            fb.set(c, (config.ROWS-1) - r, colors_bars[r])  # (0,0,150)
@@ -5,9 +5,14 @@
 # - Bottom row is seeded with random heat
 # - Each cell above looks at the cell below, subtracts a random decay,
 #   and shifts a bit sideways, producing a rising fire effect.
+#
+# Everything is bytes: heat is a bytearray, each getrandbits(32) feeds 16
+# two-bit decays, and the vertical damping is folded into a per-row GRB
+# palette built once, so drawing is one table lookup per pixel (viper on
+# the Pico). state["palette"] picks the colours: fire, plasma, acid.
 
 import config
-import grid
+import layout
 
 # Use urandom on MicroPython, random on desktop
 try:
@@ -18,11 +23,108 @@ except ImportError:
 # Fire tuning
 _MAX_INTENSITY = 36  # more steps = smoother grad
 _WIDTH  = config.COLS
-_HEIGHT = config.ROWS
+_HEIGHT = min(getattr(config, "FIRE_ROWS", config.ROWS), layout.ROWS)   # fire fills the bottom rows
+
+DEFAULT_PALETTE = "fire"
+# output (r, g, b) taken from these channels of the fire ramp
+PALETTES = {
+    "fire": (0, 1, 2),      # red -> orange -> yellow -> white
+    "plasma": (2, 1, 0),    # blue -> cyan -> white
+    "acid": (1, 0, 2),      # green -> yellow-green -> white
+}
 
-# Global state so it survives even if `state` dict is recreated
-_fire_buffer = None
-_palette = None
+try:
+    import micropython
+
+    @micropython.viper
+    def _update(heat, bits, w: int, h: int, seed: int, top: int):
+        hp = ptr8(heat)
+        b = ptr8(bits)
+        k = 0
+        # seed the bottom row: seed + 0..3
+        base = (h - 1) * w
+        x = 0
+        while x < w:
+            v = seed + ((b[k >> 2] >> ((k & 3) << 1)) & 3)
+            hp[base + x] = v if v < top else top
+            x += 1
+            k += 1
+        # propagate upwards, each cell from the one below
+        y = 0
+        while y < h - 1:
+            row = y * w
+            x = 0
+            while x < w:
+                below = hp[row + w + x]
+                if below == 0:
+                    hp[row + x] = 0
+                else:
+                    d = (b[k >> 2] >> ((k & 3) << 1)) & 3
+                    v = below - d
+                    if v < 0:
+                        v = 0
+                    dx = x - d + 1
+                    if dx < 0:
+                        dx = 0
+                    elif dx >= w:
+                        dx = w - 1
+                    hp[row + dx] = v
+                x += 1
+                k += 1
+            y += 1
+
+    @micropython.viper
+    def _blit(buf, heat, xy, pal, w: int, n: int, first: int, levels: int):
+        d = ptr8(buf)
+        hp = ptr8(heat)
+        m = ptr16(xy)
+        p = ptr8(pal)
+        i = 0
+        while i < n:
+            s = m[first + i]
+            if s != 0xFFFF:
+                o = ((i // w) * levels + hp[i]) * 3
+                s *= 3
+                d[s] = p[o]
+                d[s + 1] = p[o + 1]
+                d[s + 2] = p[o + 2]
+            i += 1
+except Exception:
+    def _update(heat, bits, w, h, seed, top):
+        k = 0
+        base = (h - 1) * w
+        for x in range(w):
+            v = seed + ((bits[k >> 2] >> ((k & 3) << 1)) & 3)
+            heat[base + x] = v if v < top else top
+            k += 1
+        for y in range(h - 1):
+            row = y * w
+            for x in range(w):
+                below = heat[row + w + x]
+                if below == 0:
+                    heat[row + x] = 0
+                else:
+                    d = (bits[k >> 2] >> ((k & 3) << 1)) & 3
+                    v = below - d
+                    if v < 0:
+                        v = 0
+                    dx = x - d + 1
+                    if dx < 0:
+                        dx = 0
+                    elif dx >= w:
+                        dx = w - 1
+                    heat[row + dx] = v
+                k += 1
+
+    def _blit(buf, heat, xy, pal, w, n, first, levels):
+        for i in range(n):
+            s = xy[first + i]
+            if s != 0xFFFF:
+                o = ((i // w) * levels + heat[i]) * 3
+                s *= 3
+                buf[s] = pal[o]
+                buf[s + 1] = pal[o + 1]
+                buf[s + 2] = pal[o + 2]
 
 
 def _build_palette():
@@ -57,83 +159,79 @@ def _build_palette():
     return palette
 
 
-def _init():
-    global _fire_buffer, _palette
-    if _fire_buffer is None:
-        _fire_buffer = [_MAX_INTENSITY] * (_WIDTH * _HEIGHT)
-    if _palette is None:
-        _palette = _build_palette()
-
-
-def _idx(x, y):
-    return y * _WIDTH + x
-
-
-def _update_fire():
+def row_palette(name=DEFAULT_PALETTE, height=_HEIGHT):
     """
-    Update the fire buffer in-place.
-    Bottom row is the "fuel line", everything above is derived from it.
+    GRB bytes for every (row, heat): the palette with the vertical damping
+    folded in (1.0 at the bottom row, ~0 at the top, squared falloff).
     """
-    # Seed bottom row with random heat
-    for x in range(_WIDTH):
-        # Flicker between ~3/4 and full intensity
-        base = _MAX_INTENSITY * 3 // 4
-        extra = _random.getrandbits(2)  # 0..3
-        val = min(_MAX_INTENSITY, base + extra)
-        _fire_buffer[_idx(x, _HEIGHT - 1)] = val
-
-    # Propagate upwards
-    # Start from y=0 (top) and look at y+1 (below)
-    for y in range(_HEIGHT - 1):
-        for x in range(_WIDTH):
-            src = _idx(x, y + 1)
-            below_int = _fire_buffer[src]
-
-            if below_int == 0:
-                _fire_buffer[_idx(x, y)] = 0
-            else:
-                decay = _random.getrandbits(2)  # 0..3
-                new_int = below_int - decay
-                if new_int < 0:
-                    new_int = 0
-
-                # Shift a bit sideways for that classic Doom wobble
-                dst_x = x - decay + 1
-                if dst_x < 0:
-                    dst_x = 0
-                elif dst_x >= _WIDTH:
-                    dst_x = _WIDTH - 1
-
-                _fire_buffer[_idx(dst_x, y)] = new_int
-
-
-def step(np, state, t):
+    order = PALETTES.get(name, PALETTES[DEFAULT_PALETTE])
+    ramp = _build_palette()
+    levels = _MAX_INTENSITY + 1
+    pal = bytearray(height * levels * 3)
+    for y in range(height):
+        row_factor = (y / (height - 1)) ** 2 if height > 1 else 1
+        for v in range(levels):
+            c = ramp[min(_MAX_INTENSITY, int(v * row_factor))]
+            o = (y * levels + v) * 3
+            pal[o] = c[order[1]]
+            pal[o + 1] = c[order[0]]
+            pal[o + 2] = c[order[2]]
+    return pal
+
+
+class FireEngine:
+    def __init__(self, width=_WIDTH, height=_HEIGHT, palette=DEFAULT_PALETTE):
+        if height > layout.ROWS:
+            height = layout.ROWS    # blit() draws into the bottom rows of the grid
+        self.width = width
+        self.height = height
+        self.heat = bytearray(bytes((_MAX_INTENSITY,)) * (width * height))
+        self.words = (width * height + 15) // 16
+        self.bits = bytearray(self.words * 4)
+        self.set_palette(palette)
+
+    def set_palette(self, name):
+        self.palette_name = name
+        self.pal = row_palette(name, self.height)
+
+    def update(self):
+        bits = self.bits
+        rnd = _random.getrandbits
+        for j in range(0, self.words * 4, 4):
+            r = rnd(32)             # 16 decays of 2 bits
+            bits[j] = r & 0xFF
+            bits[j + 1] = (r >> 8) & 0xFF
+            bits[j + 2] = (r >> 16) & 0xFF
+            bits[j + 3] = r >> 24
+        _update(self.heat, bits, self.width, self.height,
+                _MAX_INTENSITY * 3 // 4, _MAX_INTENSITY)
+
+    def blit(self, fb):
+        """Draw into fb's bottom rows (needs width == layout.COLS)."""
+        first = (layout.ROWS - self.height) * layout.COLS
+        _blit(fb.buf, self.heat, layout.XY, self.pal, self.width,
+              self.width * self.height, first, _MAX_INTENSITY + 1)
+
+
+_engine = None
+
+
+def init(state):
+    global _engine
+    _engine = FireEngine(palette=state.get("palette", DEFAULT_PALETTE))
+
+
+def step(fb, state, t):
     """
     Main mode entrypoint. Ignores `t` and uses its own internal state.
     Call this every frame.
-
-    This version damps intensity toward the top so the fire looks shorter
-    and leaves black space above.
     """
-    _init()
-    _update_fire()
-
-    for y in range(_HEIGHT):
-        # scale factor: 1.0 at bottom row, ~0 at top row
-        # tweak the exponent (2.0) for sharper/softer falloff
-        row_factor = (y / (_HEIGHT - 1)) ** 2
-
-        for x in range(_WIDTH):
-            intensity = _fire_buffer[_idx(x, y)]
-            # apply vertical damping so upper rows are darker/black
-            damped = int(intensity * row_factor)
-            if damped < 0:
-                damped = 0
-            if damped > _MAX_INTENSITY:
-                damped = _MAX_INTENSITY
-
-            color = _palette[damped]
-            np[grid.xy_to_pixel(x, y)] = color
-
-    np.write()
-
+    if _engine is None:
+        init(state)
+    name = state.get("palette", DEFAULT_PALETTE)
+    if name != _engine.palette_name:
+        _engine.set_palette(name)
+    _engine.update()
+    if _engine.height < layout.ROWS:
+        fb.clear()
+    _engine.blit(fb)
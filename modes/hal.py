@@ -1,7 +1,14 @@
 # modes/hal.py – HAL 9000 eye pulse (scaled for wide, short display)
+#
+# The geometry never changes between frames, only the pulse does: every
+# pixel is classified once into a band (core, ring, glow, dim dot, black)
+# and each frame just fills a 5-entry colour table and paints the strip
+# through the band map. state["hal_cx"] / ["hal_cy"] move the eye (grid
+# columns/rows, default centre) and state["hal_radius"] scales it (1.0 =
+# default); the map is rebuilt only when one of them changes.
 import math
-import grid
 import config
+import layout
 
 # HAL-ish colors
 BLACK = (0, 0, 0)
@@ -10,8 +17,84 @@ MID_RED = (60, 0, 0)
 HAL_RED = (255, 40, 20)
 HAL_CORE = (255, 120, 80)
 
-
-def step(np, state, t):
+CORE, RING, GLOW, DOT, DARK = 0, 1, 2, 3, 4
+MIN_RADIUS = 0.05           # smaller (or 0, or nan) from state is clamped to this
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _paint(buf, band, colors, n: int):
+        d = ptr8(buf)
+        b = ptr8(band)
+        c = ptr8(colors)
+        i = 0
+        j = 0
+        while i < n:
+            o = b[i] * 3
+            d[j] = c[o]
+            d[j + 1] = c[o + 1]
+            d[j + 2] = c[o + 2]
+            j += 3
+            i += 1
+except Exception:
+    def _paint(buf, band, colors, n):
+        j = 0
+        for i in range(n):
+            o = band[i] * 3
+            buf[j] = colors[o]
+            buf[j + 1] = colors[o + 1]
+            buf[j + 2] = colors[o + 2]
+            j += 3
+
+
+def band_map(cx=None, cy=None, radius=1.0):
+    """Band of every strip pixel (bytearray, strip order) for an eye at (cx, cy)."""
+    cols = config.COLS
+    rows = config.ROWS
+    if cx is None:
+        cx = (cols - 1) / 2
+    if cy is None:
+        cy = (rows - 1) / 2
+    if not radius >= MIN_RADIUS:
+        radius = MIN_RADIUS
+    # measure “radius” with horizontal stretched (wide eye)
+    # and vertical compressed
+    sx = max(1.0, (cols / 6)) * radius   # horizontal radius
+    sy = max(1.0, (rows / 2)) * radius   # vertical radius
+    band = bytearray(layout.NUM_PIXELS)
+    for i in range(layout.NUM_PIXELS):
+        x = layout.PX[i]
+        y = layout.PY[i]
+        nx = abs(x - cx) / sx
+        ny = abs(y - cy) / sy
+        r = math.sqrt(nx * nx + ny * ny)
+        if r < 0.5:
+            band[i] = CORE      # tiny center
+        elif r < 1.1:
+            band[i] = RING      # tight ring around core
+        elif r < 1.8:
+            band[i] = GLOW      # outer glow band (subtle)
+        elif (x + y) % 3 == 0:
+            band[i] = DOT       # outside eye: a hint of dim red
+        else:
+            band[i] = DARK
+    return band
+
+
+_band = None
+_band_key = None
+_colors = bytearray(15)     # GRB per band, refilled every frame
+
+
+def _set(band, color):
+    o = band * 3
+    _colors[o] = color[1]
+    _colors[o + 1] = color[0]
+    _colors[o + 2] = color[2]
+
+
+def step(fb, state, t):
     """
     HAL 9000 Eye Pulse:
     - Designed for wide, short matrices (e.g. 21x5)
@@ -19,12 +102,11 @@ def step(np, state, t):
     - One-pixel 'ring' around it
     - Slow breathing pulse
     """
-
-    cols = config.COLS
-    rows = config.ROWS
-
-    cx = (cols - 1) / 2
-    cy = (rows - 1) / 2
+    global _band, _band_key
+    key = (state.get("hal_cx"), state.get("hal_cy"), state.get("hal_radius", 1.0))
+    if key != _band_key:
+        _band = band_map(*key)
+        _band_key = key
 
     # Slow pulse: tweak 0.5 for speed
     pulse = (math.sin(t * 0.5) + 1) / 2  # 0..1
@@ -37,55 +119,13 @@ def step(np, state, t):
     core_r = int(80 + 175 * pulse_pow)  # bright core
 
     # Occasional tiny “thinking” flicker on the core only
-    flicker = False
+    r_val = core_r
     if int(t * 8) % 37 == 0:
-        flicker = True
-
-    for x in range(cols):
-        for y in range(rows):
-            dx = abs(x - cx)
-            dy = abs(y - cy)
-
-            # For a 5-row display, don't bother with big circles:
-            # define simple "bands" around the center.
-            #
-            # core region: very small, center-ish
-            # ring region: slightly larger rectangle around it
-
-            # measure “radius” with horizontal stretched (wide eye)
-            # and vertical compressed
-            nx = dx / max(1.0, (cols / 6))   # horizontal radius
-            ny = dy / max(1.0, (rows / 2))   # vertical radius
-            r = math.sqrt(nx * nx + ny * ny)
-
-            if r < 0.5:
-                # Core pixels: tiny center
-                r_val = core_r
-                g_val = int(core_r * 0.35)
-                b_val = int(core_r * 0.2)
-
-                if flicker:
-                    r_val = min(255, r_val + 40)
-
-                color = (r_val, g_val, b_val)
-
-            elif r < 1.1:
-                # Tight ring around core
-                r_val = ring_r
-                color = (r_val, 0, 0)
-
-            elif r < 1.8:
-                # Outer glow band (subtle)
-                r_val = base_r
-                color = (r_val, 0, 0)
-
-            else:
-                # Outside eye: mostly dark with a hint of dim red
-                if (x + y) % 3 == 0:
-                    color = DIM_RED
-                else:
-                    color = BLACK
-
-            np[grid.xy_to_pixel(x, y)] = color
-
-    np.write()
+        r_val = min(255, r_val + 40)
+
+    _set(CORE, (r_val, int(core_r * 0.35), int(core_r * 0.2)))
+    _set(RING, (ring_r, 0, 0))
+    _set(GLOW, (base_r, 0, 0))
+    _set(DOT, DIM_RED)
+    _set(DARK, BLACK)
+    _paint(fb.buf, _band, _colors, layout.NUM_PIXELS)
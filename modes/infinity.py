@@ -1,13 +1,12 @@
 # modes/infinity.py
 import config
-import grid
 
-def step(np, state, t):
+def step(fb, state, t):
     # infinity repeating pattern
     # there are multiple phases with steps in each one
     # it looks like each step is maybe 1/3 of a second or so, but let's go with 1 second to keep it simple
 
-    np.fill((0,0,0))
+    fb.clear()
 
     # Figure out phase (0-5)
     phases = 8
@@ -23,58 +22,50 @@ def step(np, state, t):
         r = int(((config.ROWS // 2) +1) * phase_percent)
         for c in range(config.COLS):
             if c % 5 != 0:
-                np[grid.xy_to_pixel(c, r)] = (150,0,0)
-                np[grid.xy_to_pixel(c, config.ROWS - r -1)] = (150,0,0)
-        np.write()
+                fb.set(c, r, (150,0,0))
+                fb.set(c, config.ROWS - r -1, (150,0,0))
     
     if phase == 1: # solid red lins start in middle and fill out
         row = int(((config.ROWS // 2) +1) * phase_percent) +1
         for c in range(config.COLS):
             for r in range(row):
-                np[grid.xy_to_pixel(c, (config.ROWS //2) - r)] = (150,0,0)
-                np[grid.xy_to_pixel(c, (config.ROWS //2) + r)] = (150,0,0)
-        np.write()
+                fb.set(c, (config.ROWS //2) - r, (150,0,0))
+                fb.set(c, (config.ROWS //2) + r, (150,0,0))
 
     if phase == 2: # solid red
         for r in range(config.ROWS):
             for c in range(config.COLS):
-                np[grid.xy_to_pixel(c, r)] = (150,0,0)
-        np.write()
+                fb.set(c, r, (150,0,0))
 
     if phase == 3: # solid red collapses from left/right to middle
         middle = config.COLS //2
         cols = middle - int((middle +2 )* phase_percent)
         for r in range(config.ROWS):
             for c in range(cols):
-                np[grid.xy_to_pixel(middle + c, r)] = (150,0,0)
-                np[grid.xy_to_pixel(middle - c, r)] = (150,0,0)
-        np.write()
+                fb.set(middle + c, r, (150,0,0))
+                fb.set(middle - c, r, (150,0,0))
 
     if phase == 4: # solid blue lines middle to top/bottom
         row = int(((config.ROWS // 2) +1) * phase_percent)
         print(f"{row=}" )
         for c in range(config.COLS):
-                np[grid.xy_to_pixel(c, row)] = (0,0,150)
-                np[grid.xy_to_pixel(c, config.ROWS - row -1)] = (0,0,150)
-        np.write()
+                fb.set(c, row, (0,0,150))
+                fb.set(c, config.ROWS - row -1, (0,0,150))
 
     if phase == 5: # 3 rows of blue in the middle
         for c in range(config.COLS):
-            np[grid.xy_to_pixel(c, 1)] = (0,0,150)
-            np[grid.xy_to_pixel(c, 2)] = (0,0,150)
-            np[grid.xy_to_pixel(c, 3)] = (0,0,150)
+            fb.set(c, 1, (0,0,150))
+            fb.set(c, 2, (0,0,150))
+            fb.set(c, 3, (0,0,150))
 
-        np.write()
 
     if phase == 6: # solid blue lines middle to top/bottom
         row = int(((config.ROWS // 2) +1) * phase_percent)
         row = config.ROWS //2 - row
         print(f"{row=}" )
         for c in range(config.COLS):
-                np[grid.xy_to_pixel(c, row)] = (0,0,150)
-                np[grid.xy_to_pixel(c, config.ROWS - row -1)] = (0,0,150)
-
-        np.write()        
+                fb.set(c, row, (0,0,150))
+                fb.set(c, config.ROWS - row -1, (0,0,150))
 
     if phase == 7: # blank
-        np.write()
\ No newline at end of file
+        pass
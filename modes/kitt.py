@@ -1,11 +1,10 @@
 # modes/kitt.py
 import config
-import grid
 
-def step(np, state, t):
+def step(fb, state, t):
     # kitt = from knight rider
     # bouncing red dot with trail
-    np.fill((0,0,0))
+    fb.clear()
     print("KITT step at time", t)
     pos = (t * 20) % (2 * (config.COLS -1))
     if pos >= config.COLS:
@@ -15,6 +14,4 @@ def step(np, state, t):
         if 0 <= c < config.COLS:
             intensity = max(0, 50 - abs(offset)*20)
             for r in range(config.ROWS):
-                np[grid.xy_to_pixel(c, r)] = (intensity,0,0)    
-
-    np.write()
+                fb.set(c, r, (intensity,0,0))
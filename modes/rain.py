@@ -1,28 +1,58 @@
 # modes/rain.py
+#
+# One drop per column, kept in the shared particle pool. y is in 1/65536
+# rows (FIX) so the drops move by speed * dt without drifting; a drop wraps
+# back to the top after falling PERIOD rows (ROWS on screen + 5 off it).
 import config
-import grid
+import particles
 
-def step(np, state, t):
+FIX = 1 << 16
+PERIOD = config.ROWS + 5
+TAIL = (175, 95, 15)            # blue level of the 3 pixels above the head
+
+_drops = None
+_last_ms = None
+
+
+def init(state):
+    global _drops, _last_ms
+    _drops = particles.Pool(config.COLS)
+    for col in range(config.COLS):
+        # different speeds: 1, 1.5, 2 rows per second
+        _drops.spawn(col, 0, vy=FIX + (col % 3) * (FIX // 2))
+    _last_ms = None
+
+
+def step(fb, state, t):
     # render raindrops
     # we've got like 21 columns and 5 rows
     # t (time) is in seconds
-    # assign each colum a drop speed/existance based on time
-
-    
-    # render text in state["text"], with brightness
+    global _last_ms
+    if _drops is None:
+        init(state)
+    now_ms = int(t * 1000)
+    ys = _drops.y
+    vys = _drops.vy
+    wrap = PERIOD * FIX
+    if _last_ms is None:
+        # start where a drop that has been falling since t = 0 would be
+        for i in range(_drops.capacity):
+            ys[i] = (vys[i] * now_ms // 1000) % wrap
+    else:
+        dt = now_ms - _last_ms
+        for i in range(_drops.capacity):
+            ys[i] = (ys[i] + vys[i] * dt // 1000) % wrap
+    _last_ms = now_ms
 
-    np.fill((0,0,0))
-    for col in range(config.COLS):
-        speed = 1.0 + (col % 3) * 0.5  # different speeds
-        pos = (t * speed) % (config.ROWS + 5)  # position of drop
-        drop_row = int(pos)
-        if 0 <= drop_row < config.ROWS:
-            np[grid.xy_to_pixel(col, drop_row)] = (0,0,255)
+    fb.clear()
+    xs = _drops.x
+    for i in range(_drops.capacity):
+        col = xs[i]
+        drop_row = ys[i] >> 16
+        if drop_row < config.ROWS:
+            fb.set(col, drop_row, (0, 0, 255))
         # tail effect
-        for i in range(1,4):
-            tail_row = drop_row - i
+        for k in range(3):
+            tail_row = drop_row - 1 - k
             if 0 <= tail_row < config.ROWS:
-                brightness = max(0, 255 - i * 80)
-                np[grid.xy_to_pixel(col, tail_row)] = (0,0,brightness)
-
-    np.write()
+                fb.set(col, tail_row, (0, 0, TAIL[k]))
@@ -2,10 +2,17 @@
 import fivefont as ff
 import config
 
-def step(np, state, t):
-    # render text in state["text"], with brightness
-    color = state["color"]
-    np.fill((0,0,0))
-    ff.scroll_text(np, config.COLS, config.ROWS, state["text"], color=color, spacing=1, serpentine=True)
-    
-    np.write()
+SPEED = 25          # columns per second
+
+_scroller = None
+
+def step(fb, state, t):
+    # scroll text in state["text"] one frame at a time (never blocks)
+    global _scroller
+    text = state["text"]
+    if _scroller is None or _scroller.text != text:
+        _scroller = ff.Scroller(text, speed=state.get("scroll_speed", SPEED),
+                                width=config.COLS, height=config.ROWS)
+    _scroller.color = state["color"]
+    _scroller.loop = state.get("scroll_loop", True)
+    _scroller.step(fb, t)
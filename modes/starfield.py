@@ -1,41 +1,90 @@
-# return the RGB value for a pixel in a starfield image
-def starfield_pixel(x, y, t):
-    """
-    Generate a starfield pixel color based on position (x, y) and time t.
-    Stars twinkle and move to create a dynamic starfield effect.
-    """
-    import math
-    import random
-
-    # Parameters for starfield
-    num_stars = 100
-    width, height = 200, 200  # Assuming a 200x200 pixel starfield
-
-    # Initialize star positions and brightness
-    stars = []
-    random.seed(42)  # For reproducibility
-    for _ in range(num_stars):
-        star_x = random.randint(0, width - 1)
-        star_y = random.randint(0, height - 1)
-        brightness = random.uniform(0.5, 1.0)
-        stars.append((star_x, star_y, brightness))
-
-    # Calculate pixel color
-    r, g, b = 0, 0, 0
-    for star_x, star_y, brightness in stars:
-        # Calculate distance from the pixel to the star
-        dist = math.sqrt((x - star_x) ** 2 + (y - star_y) ** 2)
-        if dist < 5:  # Star influence radius
-            # Twinkle effect based on time
-            twinkle = (math.sin(t + dist) + 1) / 2  # Normalize to [0, 1]
-            intensity = brightness * twinkle * (1 - dist / 5)
-            r += int(255 * intensity)
-            g += int(255 * intensity)
-            b += int(255 * intensity)
-
-    # Clamp values to [0, 255]
-    r = min(255, r)
-    g = min(255, g)
-    b = min(255, b)
-
-    return (r, g, b)
\ No newline at end of file
+# modes/starfield.py — stars drifting across the visor
+#
+# The field is generated once into compact arrays (x in 1/256 pixel steps,
+# row, speed, brightness, twinkle phase). Each step moves every star by
+# speed * dt and adds it into the two pixels around its position, so a
+# frame costs O(stars), not O(pixels * stars). A star that leaves the left
+# edge comes back on the right with a new row, speed and brightness.
+from array import array
+
+import config
+import layout
+
+try:
+    import urandom as _random
+except ImportError:
+    import random as _random
+
+NUM_STARS = 16
+SUB = 256                   # sub-pixel steps per pixel
+MIN_SPEED = 2               # pixels per second
+MAX_SPEED = 12
+
+# twinkle: a triangle wave over 32 ticks, 64..255 (no math.sin per star)
+_WAVE = bytearray(min(255, 64 + (i if i < 16 else 32 - i) * 12) for i in range(32))
+
+_x = None                   # array('h'): x * SUB
+_y = None                   # bytearray: row
+_speed = None               # array('H'): SUB steps per second
+_level = None               # bytearray: peak brightness
+_phase = None               # bytearray: twinkle offset into _WAVE
+_last_t = None
+
+
+def _spawn(i, x):
+    _x[i] = x
+    _y[i] = _random.getrandbits(8) % config.ROWS
+    _speed[i] = (MIN_SPEED * SUB
+                 + _random.getrandbits(16) % ((MAX_SPEED - MIN_SPEED) * SUB))
+    _level[i] = 96 + _random.getrandbits(8) % 160
+    _phase[i] = _random.getrandbits(5)
+
+
+def init(state):
+    global _x, _y, _speed, _level, _phase, _last_t
+    _x = array("h", bytes(2 * NUM_STARS))
+    _y = bytearray(NUM_STARS)
+    _speed = array("H", bytes(2 * NUM_STARS))
+    _level = bytearray(NUM_STARS)
+    _phase = bytearray(NUM_STARS)
+    _last_t = None
+    for i in range(NUM_STARS):
+        _spawn(i, _random.getrandbits(16) % (config.COLS * SUB))
+
+
+def _add(buf, x, y, v):
+    # saturating add of a grey level into pixel (x, y)
+    if 0 <= x < config.COLS:
+        i = layout.XY[y * layout.COLS + x]
+        if i == layout.NONE:
+            return
+        i *= 3
+        for k in (i, i + 1, i + 2):
+            s = buf[k] + v
+            buf[k] = s if s < 255 else 255
+
+
+def step(fb, state, t):
+    global _last_t
+    if _x is None:
+        init(state)
+    dt_ms = 0 if _last_t is None else int((t - _last_t) * 1000)
+    if dt_ms < 0:
+        dt_ms = 0               # show clock re-synced backwards
+    _last_t = t
+    tick = int(t * 8)           # twinkle clock
+
+    fb.clear()
+    buf = fb.buf
+    edge = config.COLS * SUB
+    for i in range(NUM_STARS):
+        x = _x[i] - _speed[i] * dt_ms // 1000
+        if x < -SUB:
+            _spawn(i, edge + _random.getrandbits(10))
+            continue
+        _x[i] = x
+        v = (_level[i] * _WAVE[(tick + _phase[i]) & 31]) >> 8
+        px = x >> 8             # SUB = 256
+        frac = x & 255
+        _add(buf, px, _y[i], (v * (SUB - frac)) >> 8)
+        _add(buf, px + 1, _y[i], (v * frac) >> 8)
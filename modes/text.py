@@ -2,10 +2,10 @@
 import fivefont as ff
 import config
 
-def step(np, state, t):
+STATIC = True   # frame only changes with state (see main.py)
+
+def step(fb, state, t):
     # render text in state["text"], with brightness
     color = state["color"]
-    np.fill((0,0,0))
-    ff.draw_text(np, config.COLS, config.ROWS, state["text"],color=color, spacing=1, serpentine=True)
-
-    np.write()
+    fb.clear()
+    ff.draw_text(fb, config.COLS, config.ROWS, state["text"],color=color, spacing=1, serpentine=True)
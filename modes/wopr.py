@@ -1,6 +1,22 @@
-import random
-import config
-import grid
+# modes/wopr.py — WarGames "WOPR" war-room board, one agent per LED
+#
+# Every agent shows the outcome of its current simulation and re-rolls after
+# 1-10 s. Agents sit on a timing wheel (one slot per 1/8 s, linked lists in
+# arrays), so a frame only touches the agents that are due instead of
+# scanning all of them. States live in a bytearray, changed agents are
+# written straight into a cached GRB frame, and each DEFCON level has a
+# precomputed lookup table so picking a state is one random draw + index.
+# Sim takes any list of strip indices, so several independent boards can
+# share one display.
+from array import array
+
+import framebuffer
+import layout
+
+try:
+    import urandom as _random
+except ImportError:
+    import random as _random
 
 # ---------------------------------------------------------------------------
 # Colour palette (R, G, B)
@@ -31,54 +47,155 @@ DEFCON_LEVELS = {
     1: dict(green=  5, black= 77, yellow= 10, red= 11),
 }
 
+# Timing wheel: durations are 1-10 s, so a wheel longer than 10 s never
+# holds an agent for more than one lap and everything in a slot is due.
+TICK_HZ = 8
+MIN_TICKS = 1 * TICK_HZ
+MAX_TICKS = 10 * TICK_HZ
+WHEEL = 128                     # slots, a power of two > MAX_TICKS
+_MASK = WHEEL - 1
+_END = 0xFFFF                   # end of a slot's list
+
+
+def _build_tables():
+    # one bytearray per level: entry r is the state for random draw r
+    tables = {}
+    for level, w in DEFCON_LEVELS.items():
+        table = bytearray()
+        for state, name in ((STATE_GREEN, 'green'), (STATE_BLACK, 'black'),
+                            (STATE_YELLOW, 'yellow'), (STATE_RED, 'red')):
+            table.extend(bytes((state,)) * w[name])
+        tables[level] = table
+    return tables
+
+
+_TABLES = _build_tables()
+# GRB bytes per state, ready to copy into a frame
+_GRB = bytes(c for r, g, b in PALETTE for c in (g, r, b))
+
+
 def pick_state(defcon):
-    w     = DEFCON_LEVELS.get(defcon, DEFCON_LEVELS[5])
-    total = w['green'] + w['black'] + w['yellow'] + w['red']
-    r     = random.random() * total
-    if r < w['green']:
-        return STATE_GREEN
-    if r < w['green'] + w['black']:
-        return STATE_BLACK
-    if r < w['green'] + w['black'] + w['yellow']:
-        return STATE_YELLOW
-    return STATE_RED
+    table = _TABLES.get(defcon, _TABLES[5])
+    return table[_random.getrandbits(16) % len(table)]
+
 
 def pick_duration():
-    return 1.0 + random.random() * 9.0  # 1 – 10 seconds
+    """1 – 10 seconds, in wheel ticks."""
+    return MIN_TICKS + _random.getrandbits(8) % (MAX_TICKS - MIN_TICKS + 1)
+
+
+class Sim:
+    """A board of agents; agent k is drawn on strip pixel pix[k]."""
+
+    def __init__(self, pix, defcon=5, tick=0):
+        self.pix = pix
+        self.n = len(pix)
+        self.states = bytearray(self.n)
+        self._link = array('H', bytes(2 * self.n))      # next agent in the same slot
+        self._head = array('H', (_END for _ in range(WHEEL)))
+        self.tick = tick
+        self.defcon = defcon
+        for k in range(self.n):
+            self.states[k] = pick_state(defcon)
+        self._stagger()
+
+    def _stagger(self):
+        # every agent on a random timer 1..MAX_TICKS ahead of self.tick
+        # (never the current slot: advance() starts after self.tick)
+        head = self._head
+        for slot in range(WHEEL):
+            head[slot] = _END
+        for k in range(self.n):
+            self._put(k, self.tick + 1 + _random.getrandbits(8) % MAX_TICKS)
+
+    def _put(self, k, tick):
+        slot = tick & _MASK
+        self._link[k] = self._head[slot]
+        self._head[slot] = k
+
+    def set_defcon(self, defcon):
+        """Re-roll every agent now so the new mix shows immediately."""
+        self.defcon = defcon
+        head = self._head
+        for slot in range(WHEEL):
+            head[slot] = _END
+        for k in range(self.n):
+            self.states[k] = pick_state(defcon)
+            self._put(k, self.tick + pick_duration())
+
+    def draw(self, buf):
+        states = self.states
+        pix = self.pix
+        for k in range(self.n):
+            i = pix[k] * 3
+            s = states[k] * 3
+            buf[i:i + 3] = _GRB[s:s + 3]
+
+    def advance(self, tick, buf):
+        """Run the wheel up to `tick`, redrawing the agents that re-rolled."""
+        if tick < self.tick:
+            # time went backwards (show clock re-synced): re-base the wheel,
+            # keeping what is on screen
+            self.tick = tick
+            self._stagger()
+            return
+        if tick == self.tick:
+            return
+        start = self.tick + 1
+        if tick - start >= WHEEL:
+            start = tick - WHEEL + 1        # long gap: every slot once is enough
+        head = self._head
+        link = self._link
+        states = self.states
+        pix = self.pix
+        table = _TABLES.get(self.defcon, _TABLES[5])
+        size = len(table)
+        rnd = _random.getrandbits
+        for now in range(start, tick + 1):
+            slot = now & _MASK
+            k = head[slot]
+            head[slot] = _END
+            while k != _END:
+                nxt = link[k]
+                s = table[rnd(16) % size]
+                states[k] = s
+                i = pix[k] * 3
+                s *= 3
+                buf[i] = _GRB[s]
+                buf[i + 1] = _GRB[s + 1]
+                buf[i + 2] = _GRB[s + 2]
+                self._put(k, now + MIN_TICKS + rnd(8) % (MAX_TICKS - MIN_TICKS + 1))
+                k = nxt
+        self.tick = tick
+
+
+_sim = None
+_frame = None               # Framebuffer holding the board between frames
+
+
+def teardown(state):
+    global _sim, _frame
+    _sim = None
+    _frame = None
+
 
 # ---------------------------------------------------------------------------
 # Step — called each frame.
 # `state` is a dict that persists between calls (owned by the caller).
 # `t`     is elapsed seconds (float).
 # ---------------------------------------------------------------------------
-def step(np, state, t):
+def step(fb, state, t):
+    global _sim, _frame
     defcon = state.get('defcon', 5)
-    n      = config.COLS * config.ROWS
-
-    # First call — seed every agent with a staggered random timer
-    if 'agent_states' not in state:
-        state['agent_states']  = [pick_state(defcon) for _ in range(n)]
-        state['next_change']   = [random.random() * 10.0 for _ in range(n)]
-        state['last_defcon']   = defcon
-
-    agent_states = state['agent_states']
-    next_change  = state['next_change']
-
-    # DEFCON changed — flush all timers so the new mix takes effect immediately
-    if state['last_defcon'] != defcon:
-        state['last_defcon'] = defcon
-        for i in range(n):
-            next_change[i] = 0.0
-
-    # Tick agents whose timer has expired
-    for i in range(n):
-        if t >= next_change[i]:
-            agent_states[i] = pick_state(defcon)
-            next_change[i]  = t + pick_duration()
-
-    # Render
-    for y in range(config.ROWS):
-        for x in range(config.COLS):
-            np[grid.xy_to_pixel(x, y)] = PALETTE[agent_states[y * config.COLS + x]]
-
-    np.write()
+    tick = int(t * TICK_HZ)
+
+    if _sim is None:
+        _frame = framebuffer.Framebuffer()
+        _sim = Sim(array('H', range(layout.NUM_PIXELS)), defcon, tick)
+        _sim.draw(_frame.buf)
+    elif _sim.defcon != defcon:
+        _sim.set_defcon(defcon)
+        _sim.draw(_frame.buf)
+
+    _sim.advance(tick, _frame.buf)
+    fb.copy_from(_frame)
@@ -0,0 +1,275 @@
+# nprender.py — NumPy renderer for the desktop simulator / offline renders
+#
+# Array versions of fire, hal, eqbars, rain and grot: each frame is computed
+# as a whole (ROWS, COLS, 3) uint8 RGB array instead of per-pixel fb.set()
+# calls, so hours of content can be batch-rendered and exported to .dpa.
+# The output is pixel-exact with the scalar modes in modes/ (the ones that
+# run on the Pico); check it with
+#
+#   python nprender.py parity [--frames 600]
+#   python nprender.py export fire fire.dpa [--seconds 60] [--fps 30]
+#
+# fire draws its randomness from the same `random` stream and in the same
+# order as modes/fire.py (getrandbits(32) per 16 cells), so a seeded export
+# matches the device bit for bit.
+# Desktop only: needs NumPy, never copied to the Pico.
+import argparse
+import importlib
+import math
+import random
+
+import numpy as np
+
+import anim
+import config
+import framebuffer
+import layout
+
+ROWS = config.ROWS
+COLS = config.COLS
+
+# strip order: pixel i of the strip is grid cell (_PY[i], _PX[i])
+_PX = np.frombuffer(bytes(layout.PX), dtype=np.uint8).astype(np.intp)
+_PY = np.frombuffer(bytes(layout.PY), dtype=np.uint8).astype(np.intp)
+
+
+def _blank():
+    return np.zeros((ROWS, COLS, 3), dtype=np.uint8)
+
+
+# ---- hal ---------------------------------------------------------------------------
+
+def _hal_bands(cx=None, cy=None, radius=1.0):
+    # same bands as modes/hal.band_map: 0 core, 1 ring, 2 glow, 3 dim dot, 4 black
+    if cx is None:
+        cx = (COLS - 1) / 2
+    if cy is None:
+        cy = (ROWS - 1) / 2
+    x = np.arange(COLS, dtype=np.float64)[None, :]
+    y = np.arange(ROWS, dtype=np.float64)[:, None]
+    nx = np.abs(x - cx) / (max(1.0, (COLS / 6)) * radius)
+    ny = np.abs(y - cy) / (max(1.0, (ROWS / 2)) * radius)
+    r = np.sqrt(nx * nx + ny * ny)
+    dots = ((np.arange(COLS)[None, :] + np.arange(ROWS)[:, None]) % 3) == 0
+    return np.select([r < 0.5, r < 1.1, r < 1.8, dots], [0, 1, 2, 3], 4)
+
+
+_hal_band = None
+
+
+def hal(t):
+    global _hal_band
+    if _hal_band is None:
+        _hal_band = _hal_bands()
+    pulse = (math.sin(t * 0.5) + 1) / 2
+    pulse_pow = pulse * pulse
+    base_r = int(15 + 40 * pulse_pow)
+    ring_r = int(40 + 120 * pulse_pow)
+    core_r = int(80 + 175 * pulse_pow)
+    core = min(255, core_r + 40) if int(t * 8) % 37 == 0 else core_r
+    colors = np.array([
+        (core, int(core_r * 0.35), int(core_r * 0.2)),
+        (ring_r, 0, 0),
+        (base_r, 0, 0),
+        (10, 0, 0),
+        (0, 0, 0),
+    ], dtype=np.uint8)
+    return colors[_hal_band]
+
+
+# ---- eqbars ----------------------------------------------------------------------
+
+_EQ_COLORS = np.array([(0, 100, 0), (0, 100, 0), (100, 100, 0), (100, 100, 0), (100, 0, 0)],
+                      dtype=np.uint8)
+
+
+def eqbars(t):
+    # per column: block 0..7, bar height from a sine (math.sin, like the Pico)
+    heights = np.array([round((math.sin(t / 2 * ((COLS - 1) - (c // 3 + 1))) + 1) / 2 * ROWS)
+                        for c in range(COLS)])
+    level = (ROWS - 1) - np.arange(ROWS)[:, None]       # row counted from the bottom
+    frame = _blank()
+    lit = level < heights[None, :]
+    frame[lit] = _EQ_COLORS[np.broadcast_to(level, lit.shape)[lit]]
+    return frame
+
+
+# ---- rain ------------------------------------------------------------------------
+
+class Rain:
+    """Array version of modes/rain.py: same fixed-point drop positions."""
+
+    def __init__(self):
+        rain = importlib.import_module("modes.rain")
+        self.fix = rain.FIX
+        self.wrap = rain.PERIOD * rain.FIX
+        self.tail = rain.TAIL
+        self.vy = self.fix + (np.arange(COLS, dtype=np.int64) % 3) * (self.fix // 2)
+        self.y = None
+        self.last = None
+
+    def __call__(self, t):
+        now = int(t * 1000)
+        if self.last is None:
+            self.y = (self.vy * now // 1000) % self.wrap
+        else:
+            self.y = (self.y + self.vy * (now - self.last) // 1000) % self.wrap
+        self.last = now
+        frame = _blank()
+        cols = np.arange(COLS)
+        drop = self.y // self.fix
+        for i, level in enumerate((255,) + self.tail):     # head, then the tail
+            row = drop - i
+            ok = (row >= 0) & (row < ROWS)
+            frame[row[ok], cols[ok], 2] = level
+        return frame
+
+
+# ---- grot ------------------------------------------------------------------------
+
+def grot(t):
+    frame = _blank()
+    rows = np.array([int((math.sin(c + t) + 1) / 2 * 5) for c in range(COLS)])
+    cols = np.arange(COLS)
+    ok = rows < ROWS
+    frame[rows[ok], cols[ok]] = 20
+    return frame
+
+
+# ---- fire ------------------------------------------------------------------------
+
+class Fire:
+    """Array version of modes/fire.py (same heat rules, same random draws)."""
+
+    def __init__(self, rng=random, palette="fire"):
+        fire = importlib.import_module("modes.fire")
+        self.max = fire._MAX_INTENSITY
+        self.height = fire._HEIGHT
+        levels = self.max + 1
+        pal = np.frombuffer(bytes(fire.row_palette(palette, self.height)), dtype=np.uint8)
+        self.palette = pal.reshape(self.height, levels, 3)[:, :, (1, 0, 2)]   # GRB -> RGB
+        self.heat = np.full((self.height, COLS), self.max, dtype=np.intp)
+        self.words = (COLS * self.height + 15) // 16
+        self.rng = rng
+
+    def _decays(self):
+        # one getrandbits(32) per 16 cells, low bits first, like FireEngine.update()
+        words = np.array([self.rng.getrandbits(32) for _ in range(self.words)], dtype=np.uint64)
+        shifts = 2 * np.arange(16, dtype=np.uint64)
+        return ((words[:, None] >> shifts) & 3).astype(np.intp).ravel()
+
+    def __call__(self, t):
+        heat = self.heat
+        h = self.height
+        x = np.arange(COLS)
+        decay = self._decays()
+        heat[h - 1] = np.minimum(self.max, self.max * 3 // 4 + decay[:COLS])
+        for y in range(h - 1):
+            d = decay[COLS * (y + 1):COLS * (y + 2)]
+            below = heat[y + 1].copy()
+            lit = below != 0
+            dst = np.where(lit, np.clip(x - d + 1, 0, COLS - 1), x)
+            val = np.where(lit, np.maximum(below - d, 0), 0)
+            # cells are written left to right, so the last write to a column wins
+            cols, first = np.unique(dst[::-1], return_index=True)
+            heat[y, cols] = val[::-1][first]
+        frame = _blank()
+        frame[ROWS - h:] = self.palette[np.arange(h)[:, None], heat]
+        return frame
+
+
+RENDERERS = {
+    "fire": Fire,       # stateful ones are classes, one instance per render
+    "hal": hal,
+    "eqbars": eqbars,
+    "rain": Rain,
+    "grot": grot,
+}
+
+
+def renderer(name):
+    r = RENDERERS[name]
+    return r() if isinstance(r, type) else r
+
+
+# ---- output ----------------------------------------------------------------------
+
+def to_strip(frame):
+    """(ROWS, COLS, 3) RGB frame -> (NUM_PIXELS, 3) RGB in strip order."""
+    return frame[_PY, _PX]
+
+
+def to_grb(frame):
+    """Frame as the strip's GRB bytes (what Framebuffer.buf holds)."""
+    return to_strip(frame)[:, (1, 0, 2)].tobytes()
+
+
+def render(name, seconds, fps=30):
+    """Yield (t, frame) for `seconds` of mode `name` at `fps`."""
+    r = renderer(name)
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        yield t, r(t)
+
+
+def export(name, path, seconds=60, fps=30, seed=None):
+    """Render a mode to a .dpa clip: 8-bit palette if it fits, else 24-bit."""
+    if seed is not None:
+        random.seed(seed)
+    frames = [to_strip(f) for _, f in render(name, seconds, fps)]
+    clip = np.stack(frames)
+    colors, index = np.unique(clip.reshape(-1, 3), axis=0, return_inverse=True)
+    if len(colors) <= 256:
+        writer = anim.AnimWriter(path, layout.COLS, layout.ROWS, fps, 8,
+                                 [tuple(int(v) for v in c) for c in colors])
+        for f in index.reshape(len(frames), -1):
+            writer.add_frame(f.tolist())
+    else:
+        writer = anim.AnimWriter(path, layout.COLS, layout.ROWS, fps, 24, [])
+        for f in frames:
+            writer.add_frame([tuple(p) for p in f.tolist()])
+    writer.close()
+    print("wrote", path, len(frames), "frames,", len(colors), "colors")
+
+
+# ---- parity with the Pico path -------------------------------------------------
+
+def parity(frames=600, fps=30, seed=1234):
+    """Render each mode both ways and compare the strip bytes. Returns mismatching frames."""
+    bad = 0
+    fb = framebuffer.Framebuffer()
+    for name in RENDERERS:
+        mode = importlib.reload(importlib.import_module("modes." + name))   # fresh module state
+        random.seed(seed)
+        scalar = []
+        for i in range(frames):
+            fb.clear()
+            mode.step(fb, {}, i / fps)
+            scalar.append(bytes(fb.buf))
+        random.seed(seed)
+        r = renderer(name)
+        wrong = [i for i in range(frames) if to_grb(r(i / fps)) != scalar[i]]
+        print("%-8s %s" % (name, "ok" if not wrong else "%d frames differ, first %d" % (len(wrong), wrong[0])))
+        bad += len(wrong)
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser(description="NumPy renderer: parity check and .dpa export")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("parity", help="compare with the scalar modes")
+    p.add_argument("--frames", type=int, default=600)
+    e = sub.add_parser("export", help="render a mode to a .dpa clip")
+    e.add_argument("mode", choices=sorted(RENDERERS))
+    e.add_argument("dst")
+    e.add_argument("--seconds", type=float, default=60)
+    e.add_argument("--fps", type=int, default=30)
+    e.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    if args.cmd == "parity":
+        raise SystemExit(1 if parity(args.frames) else 0)
+    export(args.mode, args.dst, args.seconds, args.fps, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,180 @@
-import network
-import ntptime
-import utime
+# ntp.py — non-blocking NTP time service with drift correction
+#
+# sync_task() runs next to the render loop (main.py starts it once Wi-Fi is
+# up): it asks NTP_HOST over a non-blocking UDP socket, then again every
+# RESYNC_S. Between syncs the time is ticks_ms() since the last answer,
+# corrected by the drift measured between syncs, so the clock never has to
+# block on the network and stays right through a long event.
+#
+# localtime() adds the UTC_OFFSET_HOURS zone offset (default US Eastern) with
+# US DST rules, cached until the next DST change instead of being worked out
+# every frame. Until the first sync it
+# falls back to time.localtime() (system time on the desktop).
+import socket
+import struct
+import time
 
-wlan = network.WLAN(network.STA_IF)
-wlan.active(True)
-wlan.connect('ShArVa', 'end dirt people main zero')
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
-print('Connecting to WiFi...')
-while not wlan.isconnected():
-    utime.sleep(1)
+import bootprof
+import config
+from scheduler import ticks_ms, ticks_diff
 
-ntptime.settime()  # syncs from NTP (UTC)
-print(utime.localtime())
+HOST = getattr(config, "NTP_HOST", "pool.ntp.org")
+RESYNC_S = getattr(config, "NTP_RESYNC_S", 3600)
+RETRY_S = 30                # after a failed query
+TIMEOUT_MS = 2000
+POLL_S = 0.05               # how often a pending reply is checked for
+MIN_DRIFT_WINDOW_MS = 600000    # only measure drift over >= 10 minutes
+MAX_DRIFT_PPM = 500
 
+STD_OFFSET_S = getattr(config, "UTC_OFFSET_HOURS", -5) * 3600   # EST
+DST_OFFSET_S = STD_OFFSET_S + 3600                              # EDT
+DST_SWITCH_S = 2 * 3600     # US DST changes at 02:00 local time
+
+NTP_DELTA = 2208988800      # 1900-01-01 -> 1970-01-01 in seconds
+
+_base_ms = None             # unix time (ms) at _base_ticks, None until synced
+_base_ticks = 0
+drift_ppm = 0               # how much faster real time runs than ticks_ms()
+last_error_ms = 0           # prediction error at the last sync
+syncs = 0
+
+_offset_s = 0               # cached local offset ...
+_offset_until = None        # ... valid until this unix time (next DST change)
+
+
+def _days(y, m, d):
+    """Days from 1970-01-01 to y-m-d (proleptic Gregorian)."""
+    if m < 3:
+        y -= 1
+        m += 12
+    return 365 * y + y // 4 - y // 100 + y // 400 + (153 * (m - 3) + 2) // 5 + d - 719469
+
+
+# unix seconds of the port's time epoch (1970 on CPython, 2000 on some MicroPython ports)
+_EPOCH = _days(time.gmtime(0)[0], 1, 1) * 86400
+
+
+def _first_sunday(y, m):
+    w = (_days(y, m, 1) + 4) % 7        # 0 = Sunday (1970-01-01 was a Thursday)
+    return 1 + (7 - w) % 7
+
+
+def _dst_bounds(y):
+    """Unix times of the US DST start / end in year y (2nd Sun Mar, 1st Sun Nov, 02:00 local)."""
+    start = _days(y, 3, _first_sunday(y, 3) + 7) * 86400 + DST_SWITCH_S - STD_OFFSET_S
+    end = _days(y, 11, _first_sunday(y, 11)) * 86400 + DST_SWITCH_S - DST_OFFSET_S
+    return start, end
+
+
+def _zone(utc_s):
+    """(offset_s, unix time of the next change) for the configured zone."""
+    y = time.gmtime(utc_s - _EPOCH)[0]
+    start, end = _dst_bounds(y)
+    if utc_s < start:
+        return STD_OFFSET_S, start
+    if utc_s < end:
+        return DST_OFFSET_S, end
+    return STD_OFFSET_S, _dst_bounds(y + 1)[0]
+
+
+def _now_ms(at):
+    elapsed = ticks_diff(at, _base_ticks)
+    return _base_ms + elapsed + elapsed * drift_ppm // 1000000
+
+
+def synced():
+    return _base_ms is not None
+
+
+def now():
+    """Unix time in seconds (drift corrected), or None before the first sync."""
+    if _base_ms is None:
+        return None
+    return _now_ms(ticks_ms()) // 1000
+
+
+def localtime():
+    """Local time tuple, like time.localtime()."""
+    global _offset_s, _offset_until
+    utc_s = now()
+    if utc_s is None:
+        return time.localtime()
+    if _offset_until is None or utc_s >= _offset_until:
+        _offset_s, _offset_until = _zone(utc_s)
+    return time.gmtime(utc_s + _offset_s - _EPOCH)
+
+
+def _apply(utc_ms, at):
+    """Re-base the clock on an NTP answer taken at ticks `at`, updating the drift."""
+    global _base_ms, _base_ticks, drift_ppm, last_error_ms, syncs
+    if _base_ms is not None:
+        elapsed = ticks_diff(at, _base_ticks)
+        last_error_ms = utc_ms - _now_ms(at)    # > 0: our clock runs slow
+        if elapsed >= MIN_DRIFT_WINDOW_MS:
+            drift_ppm += last_error_ms * 1000000 // elapsed
+            drift_ppm = max(-MAX_DRIFT_PPM, min(MAX_DRIFT_PPM, drift_ppm))
+    else:
+        bootprof.mark("ntp synced")
+    _base_ms = utc_ms
+    _base_ticks = at
+    syncs += 1
+    print("NTP sync: error", last_error_ms, "ms, drift", drift_ppm, "ppm")
+
+
+async def query(host=HOST, timeout_ms=TIMEOUT_MS):
+    """One SNTP round trip without blocking the loop. Returns (unix_ms, ticks) or None."""
+    addr = socket.getaddrinfo(host, 123)[0][-1]     # DNS is the only blocking step
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.setblocking(False)
+    try:
+        req = bytearray(48)
+        req[0] = 0x1B       # LI 0, version 3, mode 3 (client)
+        sent = ticks_ms()
+        s.sendto(req, addr)
+        while ticks_diff(ticks_ms(), sent) < timeout_ms:
+            try:
+                msg = s.recv(48)
+            except OSError:
+                await asyncio.sleep(POLL_S)
+                continue
+            at = ticks_ms()
+            if len(msg) < 48:
+                return None
+            secs, frac = struct.unpack("!II", msg[40:48])   # transmit timestamp
+            if secs == 0:
+                return None     # kiss-of-death / unsynchronised server
+            ms = (secs - NTP_DELTA) * 1000 + ((frac * 1000) >> 32)
+            return ms + ticks_diff(at, sent) // 2, at       # + half the round trip
+        return None
+    finally:
+        s.close()
+
+
+async def _sync_once():
+    try:
+        answer = await query()
+    except OSError as e:    # no route / DNS failure: try again later
+        print("NTP sync failed:", e)
+        return False
+    if answer is None:
+        print("NTP sync failed: no answer")
+        return False
+    _apply(*answer)
+    return True
+
+
+async def sync_task():
+    """Sync now, then every RESYNC_S (every RETRY_S while it keeps failing)."""
+    while True:
+        ok = await _sync_once()
+        await asyncio.sleep(RESYNC_S if ok else RETRY_S)
+
+
+def sync():
+    """Blocking one-shot sync for standalone scripts (clock_mode.py)."""
+    return asyncio.run(_sync_once())
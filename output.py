@@ -0,0 +1,181 @@
+# output.py — the one place a frame goes from the framebuffer to the strip
+#
+# Brightness, gamma and a per-channel current ceiling are folded into a
+# single 256-entry bytearray LUT, rebuilt only when state["brightness"]
+# changes. Once per frame every byte of the framebuffer goes through the LUT
+# into NeoPixel.buf, then the strip is latched. Modes never have to care
+# about brightness.
+#
+# The modes' colours are still dimmed by hand, so the defaults (gamma 1.0,
+# brightness 1.0 in main.py) make the LUT an identity and keep the look
+# as it was. Raise config.GAMMA / lower state["brightness"] once a mode's
+# colours are written at full scale.
+#
+# After the LUT, the frame's current draw is estimated from per-channel
+# coefficients. If it is over config.POWER_BUDGET_MA the whole frame is
+# scaled down to fit, and average / peak draw is tracked per mode
+# (state["power"], served at /power).
+#
+# If the framebuffer and the LUT are unchanged since the last frame, the
+# whole stage and the strip write are skipped (static modes, the clock
+# within a second); `saved` counts those.
+import config
+
+GAMMA = getattr(config, "GAMMA", 1.0)      # 2.2 once modes use full-scale colours
+MAX_LEVEL = getattr(config, "MAX_LEVEL", 255)   # per-channel ceiling (current limiter)
+
+# WS2812B-ish: ~20 mA per channel at full level, ~1 mA idle per pixel
+MA_PER_CHANNEL = getattr(config, "MA_PER_CHANNEL", (20, 20, 20))   # r, g, b
+IDLE_MA_PER_PIXEL = getattr(config, "IDLE_MA_PER_PIXEL", 1)
+POWER_BUDGET_MA = getattr(config, "POWER_BUDGET_MA", 1500)         # None = no limit
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _apply_lut(dst, src, lut, n: int):
+        d = ptr8(dst)
+        s = ptr8(src)
+        t = ptr8(lut)
+        i = 0
+        while i < n:
+            d[i] = t[s[i]]
+            i += 1
+
+    @micropython.viper
+    def _sum3(buf, start: int, n: int) -> int:
+        p = ptr8(buf)
+        total = 0
+        i = start
+        while i < n:
+            total += p[i]
+            i += 3
+        return total
+
+    @micropython.viper
+    def _scale(buf, n: int, k: int):
+        p = ptr8(buf)
+        i = 0
+        while i < n:
+            p[i] = (p[i] * k) >> 8
+            i += 1
+except Exception:
+    def _apply_lut(dst, src, lut, n):
+        for i in range(n):
+            dst[i] = lut[src[i]]
+
+    def _sum3(buf, start, n):
+        total = 0
+        for i in range(start, n, 3):
+            total += buf[i]
+        return total
+
+    def _scale(buf, n, k):
+        for i in range(n):
+            buf[i] = (buf[i] * k) >> 8
+
+
+def estimate_ma(buf):
+    """Estimated strip current (mA) for a GRB buffer."""
+    n = len(buf)
+    g = _sum3(buf, 0, n)
+    r = _sum3(buf, 1, n)
+    b = _sum3(buf, 2, n)
+    return ((r * MA_PER_CHANNEL[0] + g * MA_PER_CHANNEL[1] + b * MA_PER_CHANNEL[2]) // 255
+            + IDLE_MA_PER_PIXEL * (n // 3))
+
+
+def build_lut(brightness=1.0, gamma=GAMMA, max_level=MAX_LEVEL):
+    """256-entry bytearray: v -> min(max_level, 255 * (v/255)**gamma * brightness)."""
+    lut = bytearray(256)
+    for v in range(1, 256):
+        out = int(255 * ((v / 255) ** gamma) * brightness + 0.5)
+        if out < 1 and brightness > 0:
+            out = 1             # keep dim pixels (side burns) from vanishing
+        if out > max_level:
+            out = max_level
+        lut[v] = out
+    return lut
+
+
+class Output:
+    def __init__(self, strip, budget_ma=POWER_BUDGET_MA):
+        self.strip = strip
+        self.lut = None
+        self._brightness = None
+        self.budget_ma = budget_ma
+        self.ma = 0             # estimate for the last frame sent (after limiting)
+        self.limited = 0        # frames scaled down to fit the budget
+        self.per_mode = {}      # mode -> [frames, sum_ma, peak_ma]
+        self.writes = 0         # frames pushed to the strip
+        self.saved = 0          # identical frames not pushed
+        self._last = None       # copy of the last framebuffer sent
+        self._dirty = True      # LUT changed since the last write
+
+    def set_brightness(self, brightness):
+        if brightness == self._brightness:
+            return
+        b = brightness
+        if b < 0:
+            b = 0
+        elif b > 1:
+            b = 1
+        self.lut = build_lut(b)
+        self._brightness = brightness
+        self._dirty = True
+
+    def write(self, fb, state, label=None):
+        """
+        Send fb to the strip (returns False if it was identical and skipped).
+        label names the source in the power stats (default: the mode).
+        """
+        self.set_brightness(state.get("brightness", 1.0))
+        label = label or state.get("mode")
+        n = len(fb.buf)
+        if self._last is None:
+            self._last = bytearray(n)
+        elif not self._dirty and fb.buf == self._last:
+            # nothing changed: skip the LUT pass and the strip write
+            self.saved += 1
+            self._account(label, self.ma)
+            return False
+        self._last[:] = fb.buf
+        self._dirty = False
+
+        buf = self.strip.buf
+        _apply_lut(buf, fb.buf, self.lut, n)
+
+        ma = estimate_ma(buf)
+        if self.budget_ma and ma > self.budget_ma:
+            idle = IDLE_MA_PER_PIXEL * (n // 3)
+            k = ((self.budget_ma - idle) << 8) // (ma - idle)
+            _scale(buf, n, k if k > 0 else 0)
+            ma = estimate_ma(buf)
+            self.limited += 1
+        self._account(label, ma)
+        self.strip.write()
+        self.writes += 1
+        return True
+
+    def _account(self, label, ma):
+        self.ma = ma
+        rec = self.per_mode.get(label)
+        if rec is None:
+            rec = self.per_mode[label] = [0, 0, 0]
+        rec[0] += 1
+        rec[1] += ma
+        if ma > rec[2]:
+            rec[2] = ma
+
+    def report(self):
+        modes = {}
+        for name, (frames, total, peak) in self.per_mode.items():
+            modes[name] = {"avg_ma": total // frames, "peak_ma": peak}
+        return {
+            "now_ma": self.ma,
+            "budget_ma": self.budget_ma,
+            "limited_frames": self.limited,
+            "writes": self.writes,
+            "writes_saved": self.saved,
+            "modes": modes,
+        }
@@ -0,0 +1,67 @@
+# particles.py — fixed-capacity particle pool shared by snow, rain, ...
+#
+# Particles live in parallel preallocated arrays (x, y, vx, vy, phase);
+# a dead slot goes on a free list and the next spawn() reuses it, so a
+# running effect allocates nothing per frame. Positions and velocities are
+# plain ints: the mode picks the units (whole pixels for snow, 1/65536 row
+# fixed point for rain). Walk the live ones with
+#
+#   for i in range(pool.capacity):
+#       if pool.alive[i]:
+#           ...
+from array import array
+
+try:
+    import urandom as _random
+except ImportError:
+    import random as _random
+
+
+def randint(a, b):
+    """Inclusive [a, b], drawing only as many random bits as the range needs."""
+    n = b - a + 1
+    return a + (_random.getrandbits(8 if n <= 256 else 16) % n)
+
+
+def chance(num, den):
+    return (_random.getrandbits(8 if den <= 256 else 16) % den) < num
+
+
+class Pool:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.x = array("i", bytes(4 * capacity))
+        self.y = array("i", bytes(4 * capacity))
+        self.vx = array("i", bytes(4 * capacity))
+        self.vy = array("i", bytes(4 * capacity))
+        self.phase = bytearray(capacity)
+        self.alive = bytearray(capacity)
+        self._free = array("H", range(capacity - 1, -1, -1))   # stack, lowest slot on top
+        self._top = capacity
+        self.count = 0
+
+    def spawn(self, x, y, vx=0, vy=0, phase=0):
+        """Take a free slot; returns its index, or -1 if the pool is full."""
+        if self._top == 0:
+            return -1
+        self._top -= 1
+        i = self._free[self._top]
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.phase[i] = phase
+        self.alive[i] = 1
+        self.count += 1
+        return i
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = 0
+            self._free[self._top] = i
+            self._top += 1
+            self.count -= 1
+
+    def clear(self):
+        for i in range(self.capacity):
+            self.kill(i)
@@ -0,0 +1,115 @@
+# scheduler.py — fixed-rate frame pacing for the main loop
+#
+# Keeps a ticks_ms() deadline per frame and only sleeps for whatever is left
+# of the frame budget. When a frame overruns, the next deadline is pulled
+# forward (catch up) as long as we are less than `max_catchup` frames late;
+# beyond that the missed frames are dropped and the schedule restarts from now.
+import time
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+try:
+    from time import ticks_ms, ticks_diff, ticks_add, sleep_ms
+except ImportError:
+    # Desktop (CPython) fallbacks so debug.py can use the same scheduler
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+    def ticks_add(a, delta):
+        return a + delta
+
+    def sleep_ms(ms):
+        time.sleep(ms / 1000.0)
+
+
+class FrameScheduler:
+    def __init__(self, fps=30, max_catchup=2):
+        self.fps_target = fps
+        self.frame_ms = max(1, 1000 // fps)
+        self.max_catchup = max_catchup
+        self.reset_stats()
+        self.start()
+
+    def start(self):
+        """(Re)start the schedule from now."""
+        now = ticks_ms()
+        self._frame_start = now
+        self._deadline = ticks_add(now, self.frame_ms)
+        self._window_start = now
+        self._window_frames = 0
+
+    def reset_stats(self):
+        self.frames = 0      # frames completed
+        self.overruns = 0    # frames that missed their deadline
+        self.dropped = 0     # frame slots skipped after a big overrun
+        self.worst_ms = 0    # slowest frame (work only, no sleep)
+        self.fps = 0.0       # achieved fps over the last window
+
+    def remaining_ms(self):
+        """Milliseconds left before the current frame's deadline (<0 if late)."""
+        return ticks_diff(self._deadline, ticks_ms())
+
+    def _account(self):
+        """Book-keep the frame that just finished; returns ms until deadline."""
+        now = ticks_ms()
+        work = ticks_diff(now, self._frame_start)
+        if work > self.worst_ms:
+            self.worst_ms = work
+        self.frames += 1
+
+        # achieved fps, measured over ~1 s windows
+        self._window_frames += 1
+        span = ticks_diff(now, self._window_start)
+        if span >= 1000:
+            self.fps = self._window_frames * 1000 / span
+            self._window_start = now
+            self._window_frames = 0
+
+        late = ticks_diff(now, self._deadline)
+        if late < 0:
+            return -late
+
+        self.overruns += 1
+        missed = late // self.frame_ms
+        if missed >= self.max_catchup:
+            # too far behind: drop the missed slots and resync to now
+            self.dropped += missed
+            self._deadline = now
+        return 0
+
+    def _next(self):
+        self._frame_start = ticks_ms()
+        self._deadline = ticks_add(self._deadline, self.frame_ms)
+
+    def wait(self):
+        """Call once at the end of every frame; sleeps out the rest of it."""
+        left = self._account()
+        if left > 0:
+            sleep_ms(left)
+        self._next()
+
+    async def wait_async(self):
+        """Like wait(), but yields to other asyncio tasks (web server) while idle."""
+        left = self._account()
+        # always yield, even when late, so the network tasks get a turn
+        if hasattr(asyncio, "sleep_ms"):
+            await asyncio.sleep_ms(left)
+        else:
+            await asyncio.sleep(left / 1000.0)
+        self._next()
+
+    def stats(self):
+        return {
+            "fps": round(self.fps, 1),
+            "target": self.fps_target,
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "dropped": self.dropped,
+            "worst_ms": self.worst_ms,
+        }
@@ -0,0 +1,131 @@
+# stream.py — real-time pixel streaming from a host (DDP over UDP)
+#
+# A laptop (or debug.py) renders whole frames and sends them with DDP
+# (http://www.3waylabs.com/ddp/). Packets are read straight into a
+# preallocated buffer and copied into the framebuffer with slice copies,
+# so the Pico does no per-pixel work for streamed content.
+#
+# DDP header (10 bytes, 14 with a timecode):
+#   0     flags  0x40 = version 1, 0x10 = timecode, 0x01 = push (frame done)
+#   1     seq    low 4 bits, 1..15 (0 = unsequenced)
+#   2     type   0x00 = bytes as wired (GRB, strip order) -> plain copy
+#                0x0B = RGB 8-bit (strip order) -> R/G swapped on push
+#   3     dest   output id (ignored)
+#   4..7  offset byte offset into the frame (u32 big-endian)
+#   8..9  length payload length (u16 big-endian)
+#
+# Late packets (sequence number behind the last one) are dropped. When no
+# frame arrives for `timeout_ms`, active() goes false and the main loop
+# falls back to the local mode.
+import socket
+from scheduler import ticks_ms, ticks_diff
+
+import layout
+
+FLAG_VER1 = 0x40
+FLAG_TIMECODE = 0x10
+FLAG_PUSH = 0x01
+TYPE_RAW = 0x00
+TYPE_RGB = 0x0B
+HEADER = 10
+PORT = 4048
+MAX_PER_FRAME = 8
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _swap_rg(buf, n: int):
+        p = ptr8(buf)
+        i = 0
+        while i < n:
+            t = p[i]
+            p[i] = p[i + 1]
+            p[i + 1] = t
+            i += 3
+except Exception:
+    def _swap_rg(buf, n):
+        for i in range(0, n, 3):
+            buf[i], buf[i + 1] = buf[i + 1], buf[i]
+
+
+class DdpReceiver:
+    def __init__(self, port=PORT, timeout_ms=1000, num_pixels=layout.NUM_PIXELS):
+        self.size = num_pixels * 3
+        self.timeout_ms = timeout_ms
+        self._pkt = bytearray(HEADER + 4 + self.size)
+        self._pkt_mv = memoryview(self._pkt)
+        self._frame = bytearray(self.size)      # staging, latched on push
+        self._frame_mv = memoryview(self._frame)
+        self._type = TYPE_RAW
+        self._last_seq = 0
+        self._last_frame = None
+        self.frames = 0
+        self.late = 0
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(socket.getaddrinfo("0.0.0.0", port)[0][-1])
+        self._sock.setblocking(False)
+        self._recv_into = getattr(self._sock, "recv_into", None) or self._sock.readinto
+        print("DDP stream listening on", port)
+
+    def active(self):
+        return (self._last_frame is not None
+                and ticks_diff(ticks_ms(), self._last_frame) < self.timeout_ms)
+
+    def _is_late(self, seq):
+        if not seq or not self._last_seq:
+            return False
+        behind = (self._last_seq - seq) & 0x0F
+        return 0 < behind < 8
+
+    def poll(self, fb):
+        """
+        Read pending packets; a pushed frame is copied into fb.buf.
+        Returns True while the stream is live (caller skips the local mode).
+        """
+        pkt = self._pkt
+        for _ in range(MAX_PER_FRAME):
+            try:
+                n = self._recv_into(pkt)
+            except OSError:
+                break
+            if not n:
+                break       # nothing pending (MicroPython readinto -> None)
+            if n < HEADER or (pkt[0] & 0xC0) != FLAG_VER1:
+                continue
+            flags = pkt[0]
+            seq = pkt[1] & 0x0F
+            if self._is_late(seq):
+                self.late += 1
+                continue
+            if seq:
+                self._last_seq = seq
+
+            hdr = HEADER + 4 if flags & FLAG_TIMECODE else HEADER
+            offset = int.from_bytes(pkt[4:8], "big")
+            length = (pkt[8] << 8) | pkt[9]
+            if length > n - hdr:
+                length = n - hdr
+            if offset + length > self.size:
+                length = self.size - offset
+            if length > 0:
+                self._frame_mv[offset:offset + length] = self._pkt_mv[hdr:hdr + length]
+                self._type = pkt[2]
+
+            if flags & FLAG_PUSH:
+                fb.buf[:] = self._frame
+                if self._type == TYPE_RGB:
+                    _swap_rg(fb.buf, self.size)
+                self._last_frame = ticks_ms()
+                self.frames += 1
+        return self.active()
+
+
+def pack(buf, seq=0, offset=0, data_type=TYPE_RAW, push=True):
+    """Build one DDP packet carrying buf (for senders / debug.py)."""
+    flags = FLAG_VER1 | (FLAG_PUSH if push else 0)
+    n = len(buf)
+    return (bytes((flags, seq & 0x0F, data_type, 1))
+            + offset.to_bytes(4, "big") + bytes((n >> 8, n & 0xFF)) + bytes(buf))
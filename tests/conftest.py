@@ -0,0 +1,19 @@
+# tests/conftest.py — run the device modules under CPython
+#
+# config.py is per-helmet and not checked in; when there is none on the
+# path, tests get the stock 5x21 visor.
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import config  # noqa: F401
+except ImportError:
+    config = types.ModuleType("config")
+    config.ROWS = 5
+    config.COLS = 21
+    config.HTTP_PORT = 8088
+    config.UDP_PORT = 4299
+    sys.modules["config"] = config
@@ -0,0 +1,22 @@
+import anim
+import framebuffer
+import layout
+import modes
+
+
+def test_teardown_closes_clip(tmp_path):
+    path = str(tmp_path / "clip.dpa")
+    w = anim.AnimWriter(path, layout.COLS, layout.ROWS, 10, 8, [(0, 0, 0), (9, 9, 9)])
+    for k in range(3):
+        w.add_frame([(i + k) & 1 for i in range(layout.NUM_PIXELS)])
+    w.close()
+
+    state = {"mode": "anim", "anim": path}
+    reg = modes.Registry(["anim", "wopr"], default="wopr")
+    mode = reg.get("anim", state)
+    mode.step(framebuffer.Framebuffer(), state, 0.0)
+    f = mode._reader._f
+    reg.get("wopr", state)      # switching away unloads anim
+    assert f.closed
+    assert mode._reader is None and mode._path is None
+    reg.unload(state)
@@ -0,0 +1,12 @@
+import framebuffer
+import layout
+from modes import fire
+
+
+def test_engine_height_clamped_to_grid():
+    engine = fire.FireEngine(height=layout.ROWS + 3)
+    assert engine.height == layout.ROWS
+    fb = framebuffer.Framebuffer()
+    engine.update()
+    engine.blit(fb)
+    assert fire._HEIGHT <= layout.ROWS
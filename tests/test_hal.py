@@ -0,0 +1,32 @@
+import framebuffer
+import webcontrol
+from modes import hal
+
+
+def _set(state, qs):
+    return webcontrol.handle_request(("GET /set?" + qs + " HTTP/1.1\r\n").encode(), state)
+
+
+def test_set_rejects_zero_radius():
+    state = {"mode": "wopr"}
+    assert _set(state, "mode=hal&hal_radius=0").startswith(b"HTTP/1.1 303")
+    assert state["mode"] == "hal"
+    assert "hal_radius" not in state
+    hal.step(framebuffer.Framebuffer(), state, 0.0)
+
+
+def test_set_rejects_non_finite():
+    state = {"mode": "hal"}
+    _set(state, "hal_cx=nan&hal_cy=inf&hal_radius=-inf")
+    for key in ("hal_cx", "hal_cy", "hal_radius"):
+        assert key not in state
+    _set(state, "hal_cx=3&hal_radius=1.5")
+    assert state["hal_cx"] == 3.0
+    assert state["hal_radius"] == 1.5
+
+
+def test_band_map_clamps_bad_radius():
+    for radius in (0, -1, 0.0001, float("nan")):
+        assert hal.band_map(radius=radius) == hal.band_map(radius=hal.MIN_RADIUS)
+    # a bad value already in state must not stop the render loop
+    hal.step(framebuffer.Framebuffer(), {"hal_radius": 0}, 0.0)
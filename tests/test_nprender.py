@@ -0,0 +1,9 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import nprender  # noqa: E402
+
+
+def test_parity_with_scalar_modes():
+    assert nprender.parity(frames=300) == 0
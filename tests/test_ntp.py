@@ -0,0 +1,22 @@
+import calendar
+
+import ntp
+
+
+def _utc(*t):
+    return calendar.timegm(t + (0, 0, 0))
+
+
+def test_dst_bounds_2026():
+    # EDT 2026-03-08 02:00 EST (07:00 UTC) to 2026-11-01 02:00 EDT (06:00 UTC)
+    assert ntp._dst_bounds(2026) == (_utc(2026, 3, 8, 7, 0, 0), _utc(2026, 11, 1, 6, 0, 0))
+
+
+def test_zone_2026():
+    start, end = ntp._dst_bounds(2026)
+    assert ntp._zone(_utc(2026, 3, 1, 12, 0, 0)) == (ntp.STD_OFFSET_S, start)   # 1st Sunday: still EST
+    assert ntp._zone(start - 1) == (ntp.STD_OFFSET_S, start)
+    assert ntp._zone(start) == (ntp.DST_OFFSET_S, end)
+    assert ntp._zone(end - 1) == (ntp.DST_OFFSET_S, end)
+    assert ntp._zone(end) == (ntp.STD_OFFSET_S, ntp._dst_bounds(2027)[0])
+    assert ntp._dst_bounds(2027)[0] == _utc(2027, 3, 14, 7, 0, 0)
@@ -0,0 +1,25 @@
+import framebuffer
+import output
+
+
+class _Strip:
+    def __init__(self, n):
+        self.buf = bytearray(n * 3)
+
+    def write(self):
+        pass
+
+
+def test_default_lut_keeps_mode_colours():
+    # modes still dim their own colours: the default stage must not dim again
+    assert output.build_lut(1.0) == bytearray(range(256))
+
+
+def test_side_burn_colours_stay_distinct():
+    fb = framebuffer.Framebuffer()
+    strip = _Strip(fb.n)
+    out = output.Output(strip, budget_ma=None)
+    for i, c in enumerate(((20, 0, 0), (10, 10, 0), (0, 20, 0), (0, 0, 20))):
+        fb[i] = c
+    out.write(fb, {"brightness": 1.0, "mode": "test"})
+    assert strip.buf == fb.buf
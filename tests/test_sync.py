@@ -0,0 +1,31 @@
+# show sync (udpcontrol OP_SYNC) can move the mode clock t backwards
+import framebuffer
+import fivefont
+import modes
+
+
+def test_scroller_relatches_when_time_goes_back():
+    fb = framebuffer.Framebuffer()
+    s = fivefont.Scroller("HI", width=fb.width)
+    s.step(fb, 100.0)
+    fb.clear()
+    s.step(fb, 0.0)             # synced back to the start of the show
+    fb.clear()
+    s.step(fb, 1.0)             # 25 columns in: "HI" is on screen
+    assert any(fb.buf)
+
+
+def test_registry_reset_restarts_mode():
+    state = {"mode": "wopr", "defcon": 5}
+    reg = modes.Registry(["wopr"], default="wopr")
+    fb = framebuffer.Framebuffer()
+    wopr = reg.get("wopr", state)
+    wopr.step(fb, state, 100.0)
+    reg.reset(state)
+    shown = bytes(fb.buf)
+    changed = False
+    for i in range(1, 12 * 8):
+        wopr.step(fb, state, i / 8)
+        changed = changed or bytes(fb.buf) != shown
+    assert changed
+    reg.unload(state)
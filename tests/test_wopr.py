@@ -0,0 +1,54 @@
+import random
+from array import array
+
+from modes import wopr
+
+
+def _first_rolls(sim, start, ticks):
+    # tick at which each agent first re-rolled, found by advancing one tick at a time
+    first = {}
+    for tick in range(start + 1, start + ticks + 1):
+        pending = []
+        k = sim._head[tick & (wopr.WHEEL - 1)]
+        while k != wopr._END:
+            pending.append(k)
+            k = sim._link[k]
+        for k in pending:
+            first.setdefault(k, tick)
+        sim.advance(tick, bytearray(3 * sim.n))
+    return first
+
+
+def test_first_roll_within_max_ticks():
+    for seed in range(50):
+        random.seed(seed)
+        start = 1000 + seed
+        sim = wopr.Sim(array('H', range(105)), 5, start)
+        first = _first_rolls(sim, start, wopr.MAX_TICKS)
+        assert len(first) == sim.n, "seed %d: agents left past MAX_TICKS" % seed
+
+
+def test_every_agent_on_wheel_once():
+    random.seed(1)
+    sim = wopr.Sim(array('H', range(105)), 3, 0)
+    buf = bytearray(3 * sim.n)
+    for tick in (5, 40, 400, 401):
+        sim.advance(tick, buf)
+    seen = []
+    for slot in range(wopr.WHEEL):
+        k = sim._head[slot]
+        while k != wopr._END:
+            seen.append(k)
+            k = sim._link[k]
+    assert sorted(seen) == list(range(sim.n))
+
+
+def test_backward_tick_rebases_wheel():
+    random.seed(2)
+    sim = wopr.Sim(array('H', range(105)), 5, 800)
+    buf = bytearray(3 * sim.n)
+    sim.advance(900, buf)
+    sim.advance(0, buf)             # clock re-synced backwards
+    assert sim.tick == 0
+    first = _first_rolls(sim, 0, wopr.MAX_TICKS)
+    assert len(first) == sim.n
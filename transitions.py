@@ -0,0 +1,127 @@
+# transitions.py — mix the outgoing and incoming mode on a mode switch
+#
+# While a Transition runs, main.py renders the old mode into one
+# framebuffer and the new one into another, and mix() combines them into
+# the frame. Progress is an integer 0..256 and every kind is a single
+# integer pass over the bytes:
+#
+#   cut        no transition
+#   crossfade  alpha mix
+#   wipe       new mode sweeps in from the left
+#   dissolve   pixels switch over in a fixed random order
+#   collapse   old rows close in on the middle row, new ones open out
+#              from it (like the infinity mode)
+import layout
+from compositor import _alpha
+
+try:
+    import urandom as _random
+except ImportError:
+    import random as _random
+
+KINDS = ("cut", "crossfade", "wipe", "dissolve", "collapse")
+DEFAULT_KIND = "crossfade"
+DEFAULT_MS = 600
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _select(dst, a, b, key, n: int, thr: int):
+        # pixel i from b where key[i] < thr, else from a
+        d = ptr8(dst)
+        pa = ptr8(a)
+        pb = ptr8(b)
+        k = ptr8(key)
+        i = 0
+        j = 0
+        while i < n:
+            if k[i] < thr:
+                d[j] = pb[j]
+                d[j + 1] = pb[j + 1]
+                d[j + 2] = pb[j + 2]
+            else:
+                d[j] = pa[j]
+                d[j + 1] = pa[j + 1]
+                d[j + 2] = pa[j + 2]
+            i += 1
+            j += 3
+except Exception:
+    def _select(dst, a, b, key, n, thr):
+        for i in range(n):
+            j = i * 3
+            s = b if key[i] < thr else a
+            dst[j] = s[j]
+            dst[j + 1] = s[j + 1]
+            dst[j + 2] = s[j + 2]
+
+
+def _build_keys():
+    """Per-pixel keys (strip order): column, random rank (0..255), distance from the middle row."""
+    n = layout.NUM_PIXELS
+    col = layout.PX
+    order = list(range(n))
+    for i in range(n - 1, 0, -1):           # Fisher-Yates (no random.shuffle on MicroPython)
+        j = _random.getrandbits(16) % (i + 1)
+        order[i], order[j] = order[j], order[i]
+    rank = bytearray(n)
+    for r, i in enumerate(order):
+        rank[i] = (r << 8) // n
+    mid = layout.ROWS // 2
+    dist = bytearray(abs(layout.PY[i] - mid) for i in range(n))
+    return col, rank, dist
+
+
+_keys = None
+
+
+class Transition:
+    def __init__(self, kind=DEFAULT_KIND, duration_ms=DEFAULT_MS):
+        global _keys
+        if kind not in KINDS:
+            kind = DEFAULT_KIND
+        self.kind = kind
+        self.duration_ms = duration_ms if duration_ms > 0 else 1
+        self.elapsed_ms = 0
+        if _keys is None:
+            _keys = _build_keys()
+        self._black = None
+
+    @property
+    def done(self):
+        return self.kind == "cut" or self.elapsed_ms >= self.duration_ms
+
+    def advance(self, dt_ms):
+        self.elapsed_ms += dt_ms
+
+    def progress(self):
+        """0..256"""
+        if self.elapsed_ms >= self.duration_ms:
+            return 256
+        return (self.elapsed_ms << 8) // self.duration_ms
+
+    def mix(self, dst, old, new):
+        """Combine framebuffers old and new into dst for the current progress."""
+        k = self.progress()
+        n = layout.NUM_PIXELS
+        kind = self.kind
+        if kind == "crossfade":
+            dst.copy_from(old)
+            _alpha(dst.buf, new.buf, len(dst.buf), k)
+        elif kind == "wipe":
+            _select(dst.buf, old.buf, new.buf, _keys[0], n, (k * (layout.COLS + 1)) >> 8)
+        elif kind == "dissolve":
+            _select(dst.buf, old.buf, new.buf, _keys[1], n, k)
+        elif kind == "collapse":
+            if self._black is None:
+                self._black = bytearray(len(dst.buf))
+            rows = layout.ROWS // 2 + 1     # distances 0..rows-1 from the middle row
+            if k < 128:
+                # old rows go dark from the edges in: keep dist < shown
+                shown = rows - ((k * 2 * rows) >> 8)
+                _select(dst.buf, self._black, old.buf, _keys[2], n, shown)
+            else:
+                shown = ((k - 128) * 2 * (rows + 1)) >> 8
+                _select(dst.buf, self._black, new.buf, _keys[2], n, shown)
+        else:
+            dst.copy_from(new)
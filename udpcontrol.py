@@ -0,0 +1,117 @@
+# udpcontrol.py — compact binary control protocol over UDP
+#
+# Low-latency alternative to the web UI for phone apps / show controllers.
+# Every packet is exactly PACKET_SIZE bytes:
+#
+#   0..1   magic  b"DP"
+#   2      op     OP_* below
+#   3      flags  bit0 = send an ack
+#   4..5   seq    u16 big-endian, echoed in the ack
+#   6..31  payload (26 bytes, zero padded)
+#
+#   OP_MODE        payload = mode name (ascii)
+#   OP_COLOR       payload[0:3] = r, g, b
+#   OP_TEXT        payload = text (ascii)
+#   OP_BRIGHTNESS  payload[0] = 0..255
+#   OP_DEFCON      payload[0] = 1..5
+#   OP_SYNC        payload[0:4] = show time in ms (u32 big-endian); the
+#                  render loop re-bases `t` so it equals this value now
+#
+# The ack is 6 bytes: b"DP", op | 0x80, status (ACK_*), seq.
+# poll() is called once per frame from the render loop and applies every
+# pending packet to `state`, so a change lands within one frame.
+import socket
+
+MAGIC = b"DP"
+PACKET_SIZE = 32
+PAYLOAD_SIZE = PACKET_SIZE - 6
+MAX_PER_FRAME = 8       # don't let a flood eat the frame budget
+
+OP_MODE = 1
+OP_COLOR = 2
+OP_TEXT = 3
+OP_BRIGHTNESS = 4
+OP_DEFCON = 5
+OP_SYNC = 6
+
+FLAG_ACK = 0x01
+
+ACK_OK = 0
+ACK_BAD_OP = 1
+ACK_BAD_VALUE = 2
+
+_sock = None
+
+
+def start(port=4210):
+    """Open the non-blocking control socket."""
+    global _sock
+    _sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    _sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    _sock.bind(socket.getaddrinfo("0.0.0.0", port)[0][-1])
+    _sock.setblocking(False)
+    print("UDP control listening on", port)
+    return _sock
+
+
+def _ascii(payload):
+    end = payload.find(b"\x00")
+    if end >= 0:
+        payload = payload[:end]
+    return payload.decode("utf-8", "ignore")
+
+
+def apply(packet, state, available_modes=None):
+    """Apply one packet to state. Returns an ACK_* status."""
+    op = packet[2]
+    payload = packet[6:PACKET_SIZE]
+
+    if op == OP_MODE:
+        name = _ascii(payload)
+        if available_modes is not None and name not in available_modes:
+            return ACK_BAD_VALUE
+        state["mode"] = name
+    elif op == OP_COLOR:
+        state["color"] = (payload[0], payload[1], payload[2])
+    elif op == OP_TEXT:
+        state["text"] = _ascii(payload)
+    elif op == OP_BRIGHTNESS:
+        state["brightness"] = payload[0] / 255
+    elif op == OP_DEFCON:
+        if not 1 <= payload[0] <= 5:
+            return ACK_BAD_VALUE
+        state["defcon"] = payload[0]
+    elif op == OP_SYNC:
+        state["sync_ms"] = int.from_bytes(payload[0:4], "big")
+    else:
+        return ACK_BAD_OP
+    state["rev"] = state.get("rev", 0) + 1   # tells STATIC modes to redraw
+    return ACK_OK
+
+
+def poll(state, available_modes=None):
+    """Drain pending packets (non-blocking). Call once per frame."""
+    if _sock is None:
+        return
+    for _ in range(MAX_PER_FRAME):
+        try:
+            packet, addr = _sock.recvfrom(PACKET_SIZE)
+        except OSError:
+            return      # nothing pending
+        if len(packet) != PACKET_SIZE or packet[0:2] != MAGIC:
+            continue
+        status = apply(packet, state, available_modes)
+        if packet[3] & FLAG_ACK:
+            try:
+                _sock.sendto(MAGIC + bytes((packet[2] | 0x80, status)) + packet[4:6], addr)
+            except OSError:
+                pass
+
+
+def pack(op, payload=b"", seq=0, ack=False):
+    """Build a control packet (for senders / testing from the desktop)."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    payload = payload[:PAYLOAD_SIZE]
+    return (MAGIC + bytes((op, FLAG_ACK if ack else 0)) + seq.to_bytes(2, "big")
+            + payload + bytes(PAYLOAD_SIZE - len(payload)))
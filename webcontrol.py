@@ -1,40 +1,147 @@
 # webcontrol.py — tiny, simple webserver for Pico W (MicroPython)
-import network, socket, json, time, select
-
-# ---- Wi-Fi setup at import (blocking here is ok) ---------------------------
+#
+# The server runs as an (u)asyncio task next to the render loop, so a slow
+# or half-open browser connection never stalls a frame. The same module
+# runs under CPython on the desktop (no Wi-Fi there, just the HTTP server).
+import json, time, select, socket
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+try:
+    import network
+except ImportError:
+    network = None      # desktop
 
 TIMEOUT_MS = 10000
+READ_TIMEOUT_S = 2      # give up on clients that stop talking
+MAX_HEADER_LINES = 32
+RETRY_MIN_MS = 1000     # background Wi-Fi: first retry delay, doubled per failure
+RETRY_MAX_MS = 30000
+CHECK_MS = 2000         # how often a connected link is checked for drops
+
+# ---- Wi-Fi setup ---------------------------------------------------------------
+
+def _wifi_config():
+    with open("wifi.json") as f:
+        return json.load(f)
+
 
-with open("wifi.json") as f:
-    cfg = json.load(f)
-
-wlan = network.WLAN(network.STA_IF)
-wlan.active(True)
-if not wlan.isconnected():
-    print("Connecting to", cfg["ssid"], "...")
-    wlan.connect(cfg["ssid"], cfg["password"])
-    t0 = time.ticks_ms()
-    while (not wlan.isconnected()
-           and time.ticks_diff(time.ticks_ms(), t0) < TIMEOUT_MS):
-        time.sleep_ms(100)
-
-if wlan.isconnected():
-    print("Wi-Fi STA connected:", wlan.ifconfig())
-else:
+def connect_wifi(timeout_ms=TIMEOUT_MS):
+    """Join the network from wifi.json (blocking, up to timeout_ms). Returns the WLAN or None."""
+    if network is None:
+        return None
+    cfg = _wifi_config()
+
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    if not wlan.isconnected():
+        print("Connecting to", cfg["ssid"], "...")
+        wlan.connect(cfg["ssid"], cfg["password"])
+        t0 = time.ticks_ms()
+        while (not wlan.isconnected()
+               and time.ticks_diff(time.ticks_ms(), t0) < timeout_ms):
+            time.sleep_ms(100)
+
+    if wlan.isconnected():
+        print("Wi-Fi STA connected:", wlan.ifconfig())
+        return wlan
     print("Wi-Fi connect failed.")
+    return None
 
-# ---- HTTP server: one global listening socket + poller --------------------
 
-sock = socket.socket()
-sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-addr = socket.getaddrinfo("0.0.0.0", 80)[0][-1]
-sock.bind(addr)
-sock.listen(2)
-sock.setblocking(False)   # non-blocking accept
-print("HTTP server listening on", addr)
+async def wifi_task(state, on_up=None, timeout_ms=TIMEOUT_MS):
+    """
+    Background Wi-Fi: connect, retry with backoff, reconnect when the link drops.
+    `await on_up(wlan)` runs after every (re)connect; state["wifi"] tracks the link.
+    On the desktop (no network module) on_up(None) runs once and the task ends.
+    """
+    if network is None:
+        state["wifi"] = "none"
+        if on_up:
+            await on_up(None)
+        return
+    cfg = _wifi_config()
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    backoff = RETRY_MIN_MS
+    while True:
+        if not wlan.isconnected():
+            state["wifi"] = "connecting"
+            print("Connecting to", cfg["ssid"], "...")
+            wlan.connect(cfg["ssid"], cfg["password"])
+            t0 = time.ticks_ms()
+            while (not wlan.isconnected()
+                   and time.ticks_diff(time.ticks_ms(), t0) < timeout_ms):
+                await asyncio.sleep_ms(100)
+            if not wlan.isconnected():
+                state["wifi"] = "down"
+                print("Wi-Fi connect failed, retry in", backoff, "ms")
+                wlan.disconnect()
+                await asyncio.sleep_ms(backoff)
+                backoff = min(backoff * 2, RETRY_MAX_MS)
+                continue
+            backoff = RETRY_MIN_MS
+            state["wifi"] = wlan.ifconfig()[0]
+            print("Wi-Fi STA connected:", wlan.ifconfig())
+            if on_up:
+                await on_up(wlan)
+        await asyncio.sleep_ms(CHECK_MS)
+
+# ---- HTTP server: asyncio ---------------------------------------------------------
+
+async def start_server(state, available_modes=None, host="0.0.0.0", port=80):
+    """Start the HTTP server task; it shares `state` with the render loop."""
+
+    async def _client(reader, writer):
+        try:
+            await asyncio.wait_for(_serve_client(reader, writer, state, available_modes),
+                                   READ_TIMEOUT_S)
+        except Exception as e:  # timeouts, resets: just drop the client
+            print("HTTP client dropped:", e)
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
 
-poller = select.poll()
-poller.register(sock, select.POLLIN)
+    server = await asyncio.start_server(_client, host, port)
+    print("HTTP server listening on", host, port)
+    return server
+
+
+async def _serve_client(reader, writer, state, available_modes):
+    first = await reader.readline()
+    if not first:
+        return
+    # drain the headers, we don't use them
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if not line or line == b"\r\n":
+            break
+    writer.write(handle_request(first, state, available_modes))
+    await writer.drain()
+
+# ---- HTTP server: legacy polled socket (main_safey.py) -----------------------------
+
+sock = None
+poller = None
+
+def create_server(port=80):
+    global sock, poller
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    addr = socket.getaddrinfo("0.0.0.0", port)[0][-1]
+    sock.bind(addr)
+    sock.listen(2)
+    sock.setblocking(False)   # non-blocking accept
+    print("HTTP server listening on", addr)
+
+    poller = select.poll()
+    poller.register(sock, select.POLLIN)
+    return sock
 
 
 def _parse_path_qs(first_line):
@@ -57,16 +164,25 @@ def _parse_path_qs(first_line):
     return path, params
 
 
-def _resp(cl, body, status="200 OK", ctype="text/html; charset=utf-8"):
+def _resp(body, status="200 OK", ctype="text/html; charset=utf-8"):
+    head = (
+        "HTTP/1.1 {}\r\nContent-Type: {}\r\nConnection: close\r\n\r\n"
+        .format(status, ctype)
+    )
+    return (head + body).encode() if body else head.encode()
+
+
+def _parse_float(s):
+    """Finite float from a query value, or None (empty, junk, nan, inf)."""
+    if not s:
+        return None
     try:
-        cl.send(
-            "HTTP/1.1 {}\r\nContent-Type: {}\r\nConnection: close\r\n\r\n"
-            .format(status, ctype)
-        )
-        if body:
-            cl.send(body)
-    except OSError:
-        pass
+        v = float(s)
+    except ValueError:
+        return None
+    if v - v != 0:      # nan or +-inf
+        return None
+    return v
 
 
 def _parse_color(s):
@@ -101,6 +217,8 @@ def serve_once(state, available_modes=None):
     Handle at most one HTTP request (non-blocking).
     Call this every frame from your main loop.
     """
+    if sock is None:
+        create_server()
     # Check if there's a pending connection on the listening socket
     print('X', end='')
     res = poller.poll(0)   # 0 ms → do NOT block
@@ -135,15 +253,11 @@ def serve_once(state, available_modes=None):
         if not req:
             return
 
-        first = req.split(b"\r\n", 1)[0].decode("utf-8", "ignore")
-        path, params = _parse_path_qs(first)
-        print("HTTP:", path, params, "before mode:", state["mode"])
-
-        if path.startswith("/set"):
-            _handle_set(cl, state, params)
-            return
-
-        _handle_root(cl, state, available_modes)
+        first = req.split(b"\r\n", 1)[0]
+        try:
+            cl.send(handle_request(first, state, available_modes))
+        except OSError:
+            pass
 
     finally:
         try:
@@ -152,7 +266,23 @@ def serve_once(state, available_modes=None):
             pass
 
 
-def _handle_set(cl, state, params):
+def handle_request(first_line, state, available_modes=None):
+    """Route one request line (bytes) and return the full HTTP response (bytes)."""
+    first = first_line.split(b"\r\n", 1)[0].decode("utf-8", "ignore")
+    path, params = _parse_path_qs(first)
+    print("HTTP:", path, params, "before mode:", state["mode"])
+
+    if path.startswith("/set"):
+        return _handle_set(state, params)
+    if path.startswith("/power"):
+        return _handle_power(state)
+    if path.startswith("/boot"):
+        return _handle_boot(state)
+
+    return _handle_root(state, available_modes)
+
+
+def _handle_set(state, params):
     print("Set params:", params)
     if "mode" in params:
         state["mode"] = params["mode"]
@@ -161,24 +291,47 @@ def _handle_set(cl, state, params):
         # if text supplied without mode, default to text mode
         if "mode" not in params:
             state["mode"] = "text"
+    if "overlay" in params:
+        # drawn on top of any mode: "sideburns", "clock"; "" or "none" turns it off
+        state["overlay"] = params["overlay"] if params["overlay"] not in ("", "none") else None
+    if "palette" in params and params["palette"]:
+        state["palette"] = params["palette"]    # fire: fire, plasma, acid
+    if "transition" in params and params["transition"]:
+        # how the next mode switch looks: cut, crossfade, wipe, dissolve, collapse
+        state["transition"] = params["transition"]
+    for key in ("hal_cx", "hal_cy", "hal_radius"):
+        # HAL eye position (grid columns/rows) and size (1.0 = default)
+        v = _parse_float(params.get(key))
+        if v is not None and (key != "hal_radius" or v > 0):
+            state[key] = v
     if "color" in params and params["color"]:
         parsed = _parse_color(params["color"])
         if parsed:
             state["color"] = parsed
+    state["rev"] = state.get("rev", 0) + 1   # tells STATIC modes to redraw
 
     # redirect back to root
-    try:
-        cl.send(
-            "HTTP/1.1 303 See Other\r\n"
-            "Location: /\r\n"
-            "Cache-Control: no-store\r\n"
-            "Connection: close\r\n\r\n"
-        )
-    except OSError:
-        pass
+    return (
+        b"HTTP/1.1 303 See Other\r\n"
+        b"Location: /\r\n"
+        b"Cache-Control: no-store\r\n"
+        b"Connection: close\r\n\r\n"
+    )
+
+
+def _handle_power(state):
+    # estimated current draw: now, budget, and average/peak per mode
+    power = state.get("power")
+    return _resp(json.dumps(power.report() if power else {}), ctype="application/json")
 
 
-def _handle_root(cl, state, available_modes):
+def _handle_boot(state):
+    # boot phase timings (bootprof): [{"phase", "at_ms", "ms"}, ...]
+    boot = state.get("boot")
+    return _resp(json.dumps(boot.summary() if boot else []), ctype="application/json")
+
+
+def _handle_root(state, available_modes):
     if available_modes is None:
         available_modes = []
     mode_buttons = " ".join('<a class="btn" href="/set?mode={0}">{0}</a>'.format(m) for m in available_modes)
@@ -246,6 +399,20 @@ input[type=text] {{width:80%%;font-size:1rem;padding:.3rem}}
 <a class="btn" href="/set?color=0,0,100">Blue</a>
 <a class="btn" href="/set?color=0,100,0">Green</a>
 </p>
+<p>
+    Overlay:
+    <a class="btn" href="/set?overlay=none">none</a>
+    <a class="btn" href="/set?overlay=sideburns">sideburns</a>
+    <a class="btn" href="/set?overlay=clock">clock</a>
+</p>
+<p>
+    Transition:
+    <a class="btn" href="/set?transition=cut">cut</a>
+    <a class="btn" href="/set?transition=crossfade">crossfade</a>
+    <a class="btn" href="/set?transition=wipe">wipe</a>
+    <a class="btn" href="/set?transition=dissolve">dissolve</a>
+    <a class="btn" href="/set?transition=collapse">collapse</a>
+</p>
 <p> 
     Quick text presets:
     {quick_links}
@@ -265,4 +432,4 @@ input[type=text] {{width:80%%;font-size:1rem;padding:.3rem}}
         mode_buttons=mode_buttons,
     )
 
-    _resp(cl, html)
+    return _resp(html)